@@ -0,0 +1,199 @@
+"""
+作品分类吞吐量基准测试：生成模拟作品数据，测试各分类模式的速度、内存峰值与各阶段耗时
+
+每个分类模式在独立的子进程中运行，内存峰值包含多进程分类的工作进程
+
+运行方式：python benchmarks/classifier.py [记录数量] [进程数量]
+"""
+
+from importlib import import_module
+from json import dumps, loads
+from pathlib import Path
+from random import Random
+from shutil import copyfile
+from sqlite3 import connect
+from subprocess import run
+from sys import argv, executable, path, platform
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from source.classifier import (  # noqa: E402
+    CategoryMatrix,
+    ContentClassifier,
+    DataClassifier,
+    Taxonomy,
+)
+from source.module import DataRecorder  # noqa: E402
+
+try:
+    from resource import RUSAGE_CHILDREN, RUSAGE_SELF, getrusage
+except ImportError:
+    getrusage = None
+
+WORDS = (
+    "今天",
+    "分享",
+    "一个",
+    "超级",
+    "好用",
+    "小技巧",
+    "记录",
+    "真实",
+    "感受",
+    "大家",
+    "觉得",
+    "怎么样",
+    "欢迎",
+    "评论区",
+    "交流",
+    "周末",
+    "日常",
+    "终于",
+    "发现",
+    "宝藏",
+    "姐妹们",
+    "冲",
+    "绝了",
+    "建议",
+    "收藏",
+)
+PUNCTUATION = "，。！？～ "
+MODES = (
+    "serial",
+    "serial python",
+    "process",
+    "dry run",
+    "cold cache",
+    "warm cache",
+    "incremental",
+)
+STAGES = ("read", "tokenize", "match", "score", "write")
+
+
+class Silent:
+    """丢弃分类过程中的日志输出"""
+
+    def write(self, *args, **kwargs) -> None:
+        pass
+
+
+def generate(file: Path, count: int, seed: int = 0) -> None:
+    """生成与 explore_data 结构相同的数据库，作品标题与作品标签由常用词和分类关键词组成"""
+    random = Random(seed)
+    keywords = list(Taxonomy.load().keyword_index)
+
+    def title() -> str:
+        parts = random.choices(WORDS, k=random.randint(3, 10))
+        for __ in range(random.randint(0, 2)):
+            parts.insert(random.randint(0, len(parts)), random.choice(keywords))
+        parts.append(random.choice(PUNCTUATION))
+        return "".join(parts)
+
+    def tags() -> str:
+        return " ".join(
+            random.choice(keywords) if random.random() < 0.6 else random.choice(WORDS)
+            for __ in range(random.randint(0, 8))
+        )
+
+    columns = DataRecorder.DATA_TABLE + DataRecorder.CATEGORY_TABLE
+    with connect(file) as database:
+        database.execute(
+            f"CREATE TABLE {DataRecorder.TABLE} "
+            f"({','.join(' '.join(i) for i in columns)});"
+        )
+        database.executemany(
+            f"INSERT INTO {DataRecorder.TABLE} (作品ID, 作品标题, 作品标签) "
+            "VALUES (?, ?, ?);",
+            ((f"{i:024x}", title(), tags()) for i in range(count)),
+        )
+
+
+def peak_rss() -> float:
+    """当前进程与已结束子进程的内存峰值，单位：MB"""
+    if not getrusage:
+        return 0.0
+    peak = max(getrusage(RUSAGE_SELF).ru_maxrss, getrusage(RUSAGE_CHILDREN).ru_maxrss)
+    # macOS 单位为字节，Linux 单位为 KB
+    return peak / 1024 / 1024 if platform == "darwin" else peak / 1024
+
+
+def measure(mode: str, folder: Path, workers: int) -> dict:
+    """在当前进程中运行单个分类模式"""
+    file = folder.joinpath(f"{mode}.db")
+    copyfile(folder.joinpath("ExploreData.db"), file)
+    cache = folder.joinpath("FeatureCache.db") if mode.endswith("cache") else None
+    if mode == "serial python":
+        CategoryMatrix.available = False
+    # 单独统计 jieba 词典与分类体系的加载耗时，多进程分类的工作进程仍需各自加载
+    start = perf_counter()
+    import_module("jieba").initialize()
+    taxonomy = Taxonomy.load()
+    startup = perf_counter() - start
+    start = perf_counter()
+    if mode == "incremental":
+        # 与记录作品数据时的分类方式相同，逐个作品调用分类器
+        classifier = ContentClassifier(taxonomy)
+        with connect(file) as database:
+            rows = database.execute(
+                f"SELECT 作品标题, 作品标签 FROM {DataRecorder.TABLE};"
+            ).fetchall()
+        for title, tags in rows:
+            classifier.classify_content(title or "", tags or "")
+        count, timings = len(rows), classifier.timings
+    else:
+        classifier = DataClassifier(file, taxonomy, cache)
+        count = classifier.run(
+            workers if mode == "process" else 1,
+            dry_run=mode == "dry run",
+            log=Silent(),
+        ).total()
+        timings = classifier.timings
+    return {
+        "count": count,
+        "elapsed": perf_counter() - start,
+        "startup": startup,
+        "rss": peak_rss(),
+        "timings": dict(timings),
+    }
+
+
+def main(count: int = 20_000, workers: int = 2) -> None:
+    with TemporaryDirectory() as folder:
+        start = perf_counter()
+        generate(Path(folder).joinpath("ExploreData.db"), count)
+        print(f"{count} records generated in {perf_counter() - start:.1f} s")
+        print(
+            f"{'mode':<16}{'records/s':>11}{'startup s':>11}{'run s':>9}{'peak MB':>9}"
+            + "".join(f"{i:>10}" for i in STAGES)
+        )
+        # 按顺序运行，warm cache 复用 cold cache 生成的关键词缓存
+        for mode in MODES:
+            output = run(
+                [executable, __file__, "--mode", mode, folder, str(workers)],
+                capture_output=True,
+                check=True,
+                text=True,
+            )
+            result = loads(output.stdout.splitlines()[-1])
+            speed = result["count"] / result["elapsed"]
+            timings = result["timings"]
+            stages = "".join(
+                f"{timings[i]:>10.2f}" if i in timings else f"{'-':>10}" for i in STAGES
+            )
+            print(
+                f"{mode:<16}{speed:>11.1f}{result['startup']:>11.2f}"
+                f"{result['elapsed']:>9.2f}{result['rss']:>9.1f}{stages}"
+            )
+    print(f"stage timings are summed over {workers} processes in process mode")
+
+
+if __name__ == "__main__":
+    if argv[1:2] == ["--mode"]:
+        print(dumps(measure(argv[2], Path(argv[3]), int(argv[4]))))
+    else:
+        main(
+            int(argv[1]) if len(argv) > 1 else 20_000,
+            int(argv[2]) if len(argv) > 2 else 2,
+        )
@@ -0,0 +1,101 @@
+"""
+作品分类关键词匹配基准测试：对比逐个关键词子串查找与 Aho-Corasick 自动机单次遍历
+
+运行方式：python benchmarks/classifier_keywords.py [记录数量]
+"""
+
+from pathlib import Path
+from random import Random
+from sqlite3 import connect
+from sys import argv, path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from source.classifier import KeywordMatcher, Taxonomy  # noqa: E402
+
+FILLER = "今天分享一个超级好用的小技巧记录我的真实感受大家觉得怎么样欢迎评论区交流"
+ASCII = "abcdefghijklmnopqrstuvwxyz0123456789 "
+
+
+def keywords() -> list[str]:
+    return list(Taxonomy.load().keyword_index)
+
+
+def generate(file: Path, count: int, seed: int = 0) -> None:
+    """生成与 explore_data 结构相同的数据库，仅填充分类所需字段"""
+    random = Random(seed)
+    words = keywords()
+
+    def text(length: int, hits: int) -> str:
+        parts = []
+        for __ in range(length):
+            start = random.randint(0, 20)
+            end = start + random.randint(2, 8)
+            parts.append(random.choice((FILLER, ASCII))[start:end])
+        for __ in range(hits):
+            parts.insert(random.randint(0, len(parts)), random.choice(words))
+        return "".join(parts)
+
+    with connect(file) as database:
+        database.execute(
+            "CREATE TABLE explore_data ("
+            "作品ID TEXT PRIMARY KEY, 作品标题 TEXT, 作品标签 TEXT, "
+            "类别1 TEXT, 类别2 TEXT, 类别1_ID INTEGER, 类别2_ID INTEGER"
+            ");"
+        )
+        database.executemany(
+            "INSERT INTO explore_data (作品ID, 作品标题, 作品标签) VALUES (?, ?, ?);",
+            (
+                (
+                    f"{i:024x}",
+                    text(random.randint(1, 5), random.randint(0, 2)),
+                    " ".join(
+                        text(1, random.randint(0, 1))
+                        for __ in range(random.randint(0, 8))
+                    ),
+                )
+                for i in range(count)
+            ),
+        )
+
+
+def naive(words: list[str], text: str) -> set:
+    """优化前的实现，逐个关键词在文本中查找"""
+    return {keyword for keyword in words if keyword in text}
+
+
+def timing(function, values: list[str]) -> tuple[float, list[set]]:
+    start = perf_counter()
+    result = [function(i) for i in values]
+    return perf_counter() - start, result
+
+
+def main(count: int = 100_000) -> None:
+    words = keywords()
+    with TemporaryDirectory() as folder:
+        file = Path(folder).joinpath("ExploreData.db")
+        generate(file, count)
+        with connect(file) as database:
+            texts = [
+                f"{title} {tags}" if tags else title
+                for title, tags in database.execute(
+                    "SELECT 作品标题, 作品标签 FROM explore_data;"
+                )
+            ]
+    start = perf_counter()
+    matcher = KeywordMatcher(words)
+    build = perf_counter() - start
+    before, expected = timing(lambda s: naive(words, s), texts)
+    after, result = timing(matcher.find, texts)
+    assert result == expected
+    hits = sum(map(len, result))
+    print(f"{count} records, {len(words)} keywords, {hits} keyword hits")
+    print(f"automaton build: {build * 1000:.1f} ms")
+    print(f"{'stage':<24}{'before s':>10}{'after s':>10}{'speedup':>9}")
+    print(f"{'keyword match':<24}{before:>10.3f}{after:>10.3f}{before / after:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(argv[1]) if len(argv) > 1 else 100_000)
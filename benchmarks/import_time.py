@@ -0,0 +1,72 @@
+"""
+统计各个程序入口的导入耗时与加载的可选依赖
+
+运行方式：python benchmarks/import_time.py [重复次数]
+"""
+
+from pathlib import Path
+from statistics import median
+from subprocess import run
+from sys import argv, executable
+
+ROOT = Path(__file__).resolve().parent.parent
+ENTRIES = {
+    "package": "import source",
+    "cli": "from source import cli",
+    "api": "from source import XHS",
+    "server": "from source import run_workers",
+    "tui": "from source import XHSDownloader",
+}
+DEPENDENCIES = (
+    "textual",
+    "fastapi",
+    "uvicorn",
+    "pydantic",
+    "rookiepy",
+    "pyperclip",
+    "emoji",
+    "lxml",
+    "yaml",
+)
+REPORT = "import sys; print(','.join(i for i in {0!r} if i in sys.modules))"
+
+
+def measure(statement: str) -> tuple[int, str]:
+    """返回导入耗时（微秒）与已加载的可选依赖"""
+    result = run(
+        [
+            executable,
+            "-X",
+            "importtime",
+            "-c",
+            f"{statement}; {REPORT.format(DEPENDENCIES)}",
+        ],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        # 仅统计顶层导入的 source 模块，嵌套导入已包含在累计耗时内
+        _, cumulative, name = line.split("|")
+        if name.startswith(" source"):
+            total += int(cumulative)
+    return total, result.stdout.strip()
+
+
+def main(repeat: int = 5) -> None:
+    print(f"{'entry':<10}{'median ms':>12}  dependencies")
+    for name, statement in ENTRIES.items():
+        times = []
+        loaded = ""
+        for __ in range(repeat):
+            total, loaded = measure(statement)
+            times.append(total)
+        print(f"{name:<10}{median(times) / 1000:>12.1f}  {loaded or '-'}")
+
+
+if __name__ == "__main__":
+    main(int(argv[1]) if len(argv) > 1 else 5)
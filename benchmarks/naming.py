@@ -0,0 +1,119 @@
+"""
+作品文件名称生成基准测试：对比逐字符替换实现与替换表、码位区间、名称缓存实现
+
+运行方式：python benchmarks/naming.py [名称数量]
+"""
+
+from pathlib import Path
+from random import Random
+from sys import argv, path
+from time import perf_counter
+from unicodedata import name as unicode_name
+
+path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from source.expansion import Cleaner, beautify_string  # noqa: E402
+
+ASCII = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 _-"
+CJK = "小红书作品标题测试数据分享日常生活美食旅行穿搭好物推荐记录"
+SPECIAL = ':/\\|<>"?*\t\n\x08'
+EMOJI = "😀🎉✨🌸🍜❤️👍"
+
+
+def generate(count: int, seed: int = 0) -> tuple[list[str], list[str]]:
+    """生成作品标题与作者昵称，作者昵称从有限集合中重复选取"""
+    random = Random(seed)
+
+    def text(length: int) -> str:
+        pool = random.choice((ASCII, CJK, CJK + ASCII)) + SPECIAL + EMOJI
+        return "".join(random.choice(pool) for __ in range(length))
+
+    nicknames = [text(random.randint(2, 16)) for __ in range(count // 50 or 1)]
+    titles = [text(random.randint(4, 80)) for __ in range(count)]
+    return titles, [random.choice(nicknames) for __ in range(count)]
+
+
+class Reference:
+    """优化前的实现，用于对比耗时与校验结果"""
+
+    def __init__(self):
+        self.rule = Cleaner.default_rule()
+
+    def filter_name(self, text: str, replace: str = "", default: str = "") -> str:
+        from emoji import replace_emoji
+
+        text = text.replace(":", ".")
+        text = Cleaner.CONTROL_CHARACTERS.sub("", text)
+        for i in self.rule:
+            text = text.replace(i, self.rule[i])
+        text = replace_emoji(text, replace)
+        text = " ".join(text.split())
+        return text.strip().strip(".").strip("_") or default
+
+    @staticmethod
+    def is_chinese_char(char: str) -> bool:
+        return "CJK" in unicode_name(char, "")
+
+    def truncate_string(self, s: str, length: int = 64) -> str:
+        count = 0
+        result = ""
+        for char in s:
+            count += 2 if self.is_chinese_char(char) else 1
+            if count > length:
+                break
+            result += char
+        return result
+
+    def beautify_string(self, s: str, length: int = 64) -> str:
+        count = 0
+        for char in s:
+            count += 2 if self.is_chinese_char(char) else 1
+            if count > length:
+                break
+        else:
+            return s
+        length //= 2
+        start = self.truncate_string(s, length)
+        end = self.truncate_string(s[::-1], length)[::-1]
+        return f"{start}...{end}"
+
+
+def timing(function, values: list[str]) -> tuple[float, list[str]]:
+    start = perf_counter()
+    result = [function(i) for i in values]
+    return perf_counter() - start, result
+
+
+def main(count: int = 100_000) -> None:
+    titles, nicknames = generate(count)
+    reference = Reference()
+    cleaner = Cleaner()
+    cases = (
+        ("filter_name(title)", reference.filter_name, cleaner.filter_name, titles),
+        (
+            "filter_name(nickname)",
+            reference.filter_name,
+            cleaner.filter_name,
+            nicknames,
+        ),
+        (
+            "beautify_string(title)",
+            lambda s: reference.beautify_string(s, 64),
+            lambda s: beautify_string(s, 64),
+            titles,
+        ),
+    )
+    print(f"{count} names")
+    print(f"{'stage':<24}{'before s':>10}{'after s':>10}{'speedup':>9}")
+    for name, before, after, values in cases:
+        before_time, expected = timing(before, values)
+        after_time, result = timing(after, values)
+        assert result == expected, name
+        print(
+            f"{name:<24}{before_time:>10.3f}{after_time:>10.3f}"
+            f"{before_time / after_time:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main(int(argv[1]) if len(argv) > 1 else 100_000)
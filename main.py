@@ -1,15 +1,12 @@
 from asyncio import run
 from asyncio.exceptions import CancelledError
 from contextlib import suppress
-from sys import argv
-
-from source import Settings
-from source import XHS
-from source import XHSDownloader
-from source import cli
+from sys import argv, exit
 
 
 async def app():
+    from source import XHSDownloader
+
     async with XHSDownloader() as xhs:
         await xhs.run_async()
 
@@ -19,6 +16,8 @@ async def server(
     port=5556,
     log_level="info",
 ):
+    from source import XHS, Settings
+
     async with XHS(**Settings().run()) as xhs:
         await xhs.run_server(
             host,
@@ -35,6 +34,15 @@ if __name__ == "__main__":
         if len(argv) == 1:
             run(app())
         elif argv[1] == "server":
-            run(server())
+            if len(argv) > 2 and not (argv[2].isdecimal() and int(argv[2]) > 0):
+                exit("用法：python main.py server [工作进程数量，正整数]")
+            if len(argv) > 2 and int(argv[2]) > 1:
+                from source import run_workers
+
+                run_workers(workers=int(argv[2]))
+            else:
+                run(server())
         else:
+            from source import cli
+
             cli()
@@ -1,5 +1,6 @@
-from asyncio import run
+from asyncio import run, to_thread
 from contextlib import suppress
+from importlib.util import find_spec
 from pathlib import Path as Root
 from textwrap import fill
 
@@ -16,11 +17,14 @@ from rich import print
 from rich.panel import Panel
 from rich.table import Table
 
-from source.application import XHS
+from source.application import XHS, Coordinator, Watcher
 from source.expansion import BrowserCookie
 from source.module import (
     ROOT,
     PROJECT,
+    MAX_WORKERS,
+    ERROR,
+    logging,
 )
 from source.module import Settings
 from source.translation import switch_language, _
@@ -42,6 +46,13 @@ class CLI:
         self.ctx = ctx
         self.url = ctx.params.pop("url")
         self.index = self.__format_index(ctx.params.pop("index"))
+        self.file = ctx.params.pop("file")
+        self.watch = ctx.params.pop("watch")
+        self.workers = ctx.params.pop("workers")
+        self.classify = ctx.params.pop("classify")
+        self.taxonomy = ctx.params.pop("taxonomy")
+        self.dry_run = ctx.params.pop("dry_run")
+        self.reclassify = ctx.params.pop("reclassify")
         self.path = ctx.params.pop("settings")
         self.update = ctx.params.pop("update_settings")
         self.settings = Settings(self.__check_settings_path())
@@ -58,8 +69,51 @@ class CLI:
     async def run(self):
         if self.url:
             await self.APP.extract_cli(self.url, index=self.index)
+        if self.file:
+            await self.__run_workers()
+        if self.watch:
+            await self.__run_watcher()
+        if self.classify:
+            await self.__run_classifier()
         self.__update_settings()
 
+    async def __run_workers(self):
+        coordinator = Coordinator(
+            self.parameter,
+            self.workers or MAX_WORKERS,
+        )
+        await coordinator.put_file(self.APP, Root(self.file))
+        await coordinator.run()
+
+    async def __run_watcher(self):
+        watcher = Watcher(
+            self.APP,
+            Root(self.watch),
+            self.workers or MAX_WORKERS,
+        )
+        await watcher.run()
+
+    async def __run_classifier(self):
+        if not find_spec("jieba"):
+            logging(None, _("作品分类功能依赖 jieba，请先安装 jieba"), ERROR)
+            return
+        if not (file := self.APP.data_recorder.file).is_file():
+            logging(None, _("作品数据文件不存在：{0}").format(file), ERROR)
+            return
+        from source.classifier import DataClassifier, Taxonomy
+
+        classifier = DataClassifier(
+            file,
+            Taxonomy.load(self.taxonomy and Root(self.taxonomy), ROOT),
+            file.with_name("FeatureCache.db"),
+        )
+        await to_thread(
+            classifier.run,
+            self.workers or 1,
+            dry_run=self.dry_run,
+            reclassify=self.reclassify,
+        )
+
     def __update_settings(self):
         if self.update:
             self.settings.update(self.parameter)
@@ -133,6 +187,57 @@ class CLI:
                     width=55,
                 ),
             ),
+            (
+                "--file",
+                "-f",
+                "str",
+                fill(
+                    _("读取文件中的小红书作品链接，使用多个进程批量下载作品"),
+                    width=55,
+                ),
+            ),
+            (
+                "--watch",
+                "-wa",
+                "str",
+                fill(
+                    _(
+                        "持续读取文本文件或文件夹中新增的小红书作品链接并下载作品，支持 TXT 与 NDJSON 格式"
+                    ),
+                    width=55,
+                ),
+            ),
+            (
+                "--workers",
+                "-w",
+                "int",
+                fill(
+                    _(
+                        "批量下载作品时使用的进程数量，监听模式下为同时处理的作品数量，"
+                        "分类模式下为分类进程数量"
+                    ),
+                    width=55,
+                ),
+            ),
+            (
+                "--classify",
+                "-cl",
+                "flag",
+                fill(
+                    _(
+                        "对作品数据文件中未分类的作品进行分类，中断后再次运行即可继续处理"
+                    ),
+                    width=55,
+                ),
+            ),
+            (
+                "--taxonomy",
+                "-tx",
+                "str",
+                _("作品分类体系文件，默认使用内置的分类体系"),
+            ),
+            ("--dry_run", "-dry", "flag", _("仅预览分类结果，不修改作品数据文件")),
+            ("--reclassify", "-rc", "flag", _("清空已有的分类结果，重新分类全部作品")),
             ("--work_path", "-wp", "str", _("作品数据 / 文件保存根路径")),
             ("--folder_name", "-fn", "str", _("作品文件储存文件夹名称")),
             ("--name_format", "-nf", "str", _("作品文件名称格式")),
@@ -150,6 +255,15 @@ class CLI:
             ),
             ("--max_retry", "-mr", "int", _("请求数据失败时，重试的最大次数")),
             ("--record_data", "-rd", "bool", _("是否记录作品数据至文件")),
+            (
+                "--classifier",
+                "-cf",
+                "bool",
+                fill(
+                    _("记录作品数据时是否同时对作品进行分类，需要安装 jieba"),
+                    width=55,
+                ),
+            ),
             (
                 "--image_format",
                 "-if",
@@ -227,6 +341,44 @@ class CLI:
     "--index",
     "-i",
 )
+@option(
+    "--file",
+    "-f",
+    type=Path(exists=True, dir_okay=False),
+)
+@option(
+    "--watch",
+    "-wa",
+    type=Path(exists=True),
+)
+@option(
+    "--workers",
+    "-w",
+    type=int,
+)
+@option(
+    "--classify",
+    "-cl",
+    type=bool,
+    is_flag=True,
+)
+@option(
+    "--taxonomy",
+    "-tx",
+    type=Path(exists=True, dir_okay=False),
+)
+@option(
+    "--dry_run",
+    "-dry",
+    type=bool,
+    is_flag=True,
+)
+@option(
+    "--reclassify",
+    "-rc",
+    type=bool,
+    is_flag=True,
+)
 @option(
     "--work_path",
     "-wp",
@@ -272,6 +424,11 @@ class CLI:
     "-rd",
     type=bool,
 )
+@option(
+    "--classifier",
+    "-cf",
+    type=bool,
+)
 @option(
     "--image_format",
     "-if",
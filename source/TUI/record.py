@@ -5,6 +5,7 @@ from textual.screen import ModalScreen
 from textual.widgets import Button, Input, Label
 
 from ..application import XHS
+from ..expansion import RecordUnavailable
 from ..translation import _
 
 __all__ = ["Record"]
@@ -43,7 +44,11 @@ class Record(ModalScreen):
             None,
         )
         text = self.xhs.extract_id(text)
-        await self.xhs.id_recorder.delete(text)
+        try:
+            await self.xhs.id_recorder.delete(text)
+        except RecordUnavailable as error:
+            self.app.notify(str(error), severity="error")
+            return
         self.app.notify(_("删除下载记录成功"))
 
     @on(Button.Pressed, "#enter")
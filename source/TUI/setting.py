@@ -213,8 +213,10 @@ class Setting(Screen):
 
     @on(Button.Pressed, "#save")
     def save_settings(self):
+        # 保留界面中不可编辑的参数
         self.dismiss(
-            {
+            self.data
+            | {
                 "mapping_data": self.data.get("mapping_data", {}),
                 "work_path": self.query_one("#work_path").value,
                 "folder_name": self.query_one("#folder_name").value,
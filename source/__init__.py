@@ -1,11 +1,26 @@
-from .CLI import cli
-from .TUI import XHSDownloader
-from .application import XHS
-from .module import Settings
+from importlib import import_module
 
 __all__ = [
     "XHS",
     "XHSDownloader",
     "cli",
     "Settings",
+    "run_workers",
 ]
+
+# 按需导入，避免运行单一入口时加载 TUI、Web API 等无关依赖
+_MODULES = {
+    "XHS": ".application",
+    "XHSDownloader": ".TUI",
+    "cli": ".CLI",
+    "Settings": ".module",
+    "run_workers": ".application",
+}
+
+
+def __getattr__(name: str):
+    if module := _MODULES.get(name):
+        value = getattr(import_module(module, __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
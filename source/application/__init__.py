@@ -1,3 +1,6 @@
 from .app import XHS
+from .server import run_workers
+from .watcher import Watcher
+from .worker import Coordinator
 
-__all__ = ["XHS"]
+__all__ = ["XHS", "Coordinator", "Watcher", "run_workers"]
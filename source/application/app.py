@@ -1,39 +1,56 @@
-from asyncio import Event, Queue, QueueEmpty, create_task, gather, sleep
-from contextlib import suppress
+from asyncio import (
+    Event,
+    Queue,
+    Semaphore,
+    TimeoutError,
+    as_completed,
+    create_task,
+    gather,
+    to_thread,
+    wait_for,
+)
+from contextlib import asynccontextmanager, suppress
 from datetime import datetime
+from importlib.util import find_spec
+from operator import itemgetter
+from os import getpid
 from re import compile
+from secrets import compare_digest
+from socket import gethostname
+from typing import TYPE_CHECKING, Callable
 from urllib.parse import urlparse
-
-from fastapi import FastAPI
-from fastapi.responses import RedirectResponse
+from uuid import uuid4
 
 # from aiohttp import web
-from pyperclip import copy, paste
-from uvicorn import Config, Server
 
 from source.expansion import (
     BrowserCookie,
     Cleaner,
     Converter,
     Namespace,
+    RecordUnavailable,
     beautify_string,
 )
 from source.module import (
     __VERSION__,
     ERROR,
     MASTER,
+    MAX_WORKERS,
+    METRICS,
     REPOSITORY,
     ROOT,
     VERSION_BETA,
     VERSION_MAJOR,
     VERSION_MINOR,
     WARNING,
+    Counter,
     DataRecorder,
-    ExtractData,
-    ExtractParams,
+    Gauge,
     IDRecorder,
     Manager,
     MapRecorder,
+    NoteCache,
+    RemoteRecorder,
     logging,
     sleep_time,
 )
@@ -43,9 +60,15 @@ from ..module import Mapping
 from .download import Download
 from .explore import Explore
 from .image import Image
+from .job import JobManager
 from .request import Html
 from .video import Video
 
+if TYPE_CHECKING:
+    from fastapi import FastAPI
+
+    from source.module import BatchData, ExtractParams, RequestContext
+
 __all__ = ["XHS"]
 
 
@@ -106,6 +129,12 @@ class XHS:
         write_mtime=False,
         language="zh_CN",
         read_cookie: int | str = None,
+        record_server: str = None,
+        record_token: str = "",
+        cache_ttl: int = 300,
+        cache_size: int = 1024,
+        cache_persist: bool = False,
+        classifier: bool | Callable[[str, str], tuple] = False,
         _print: bool = True,
         *args,
         **kwargs,
@@ -133,6 +162,7 @@ class XHS:
             write_mtime,
             _print,
         )
+        self.__name_values = self.__compile_name_format(self.manager.name_format)
         self.mapping_data = mapping_data or {}
         self.map_recorder = MapRecorder(
             self.manager,
@@ -144,11 +174,34 @@ class XHS:
         self.explore = Explore()
         self.convert = Converter()
         self.download = Download(self.manager)
-        self.id_recorder = IDRecorder(self.manager)
-        self.data_recorder = DataRecorder(self.manager)
+        self.id_recorder = (
+            RemoteRecorder(self.manager, record_server, record_token)
+            if record_server
+            else IDRecorder(self.manager)
+        )
+        # 设置令牌后服务器模式才会提供下载记录接口
+        self.record_token = record_token
+        self.owner = f"{gethostname()}_{getpid()}"
+        self.data_recorder = DataRecorder(
+            self.manager,
+            self.load_classifier(classifier) if record_data else None,
+        )
         self.clipboard_cache: str = ""
+        self.monitor_ids: set[str] = set()
         self.queue = Queue()
         self.event = Event()
+        self.semaphore = Semaphore(MAX_WORKERS)
+        self.cache = NoteCache(
+            cache_size,
+            cache_ttl,
+            self.manager.root.joinpath("NoteCache.db") if cache_persist else None,
+        )
+        self.jobs = JobManager(
+            self.manager.root.joinpath("TaskQueue.db"),
+            self.extract_links,
+            self.__deal_item,
+            self.owner,
+        )
         # self.runner = self.init_server()
         # self.site = None
         self.server = None
@@ -171,12 +224,19 @@ class XHS:
         index,
         log,
         bar,
+        context: "RequestContext" = None,
+        skip: bool = False,
     ):
+        """
+        :param skip: 作品是否存在下载记录，由调用方查询，避免再次请求下载记录服务器
+        """
         name = self.__naming_rules(container)
+        i = container["作品ID"]
         if (u := container["下载地址"]) and download:
-            if await self.skip_download(i := container["作品ID"]):
+            if skip:
                 logging(log, _("作品 {0} 存在下载记录，跳过下载").format(i))
             else:
+                folder = self.manager.select_folder(context and context.folder)
                 path, result = await self.download.run(
                     u,
                     container["动图地址"],
@@ -189,8 +249,16 @@ class XHS:
                     container["时间戳"],
                     log,
                     bar,
+                    folder,
+                    context and context.proxy,
+                )
+                await self.mapping.add_files(
+                    container["作者ID"],
+                    i,
+                    folder,
+                    [j for j in result if j],
                 )
-                await self.__add_record(i, result)
+                await self.__add_record(i, result, log)
         elif not u:
             logging(log, _("提取作品文件下载地址失败"), ERROR)
         await self.save_data(container)
@@ -206,9 +274,12 @@ class XHS:
         data.pop("时间戳", None)
         await self.data_recorder.add(**data)
 
-    async def __add_record(self, id_: str, result: list) -> None:
+    async def __add_record(self, id_: str, result: list, log) -> None:
         if all(result):
-            await self.id_recorder.add(id_)
+            try:
+                await self.id_recorder.add(id_)
+            except RecordUnavailable as error:
+                logging(log, str(error), ERROR)
 
     async def extract(
         self,
@@ -290,25 +361,101 @@ class XHS:
         log,
         bar,
         data: bool,
-        cookie: str = None,
-        proxy: str = None,
+        context: "RequestContext" = None,
     ):
-        if await self.skip_download(i := self.__extract_link_id(url)) and not data:
+        i = self.__extract_link_id(url)
+        # 每次领取使用不同的领取者标识，同一进程内并发处理的同一作品也不会重复下载
+        owner = f"{self.owner}_{uuid4().hex}"
+        try:
+            skip = await self.skip_download(i)
+            claim = download and not skip
+            claimed = claim and await self.id_recorder.claim(i, owner)
+        except RecordUnavailable as error:
+            # 无法确认下载记录时不处理作品，避免重复下载
+            msg = _("作品 {0} 读取下载记录失败，跳过处理: {1}").format(i, error)
+            logging(log, msg, ERROR)
+            return {"message": msg}
+        if skip and not data:
             msg = _("作品 {0} 存在下载记录，跳过处理").format(i)
             logging(log, msg)
             return {"message": msg}
+        if claim and not claimed:
+            msg = _("作品 {0} 正在被其他进程处理，跳过处理").format(i)
+            logging(log, msg)
+            return {"message": msg}
+        try:
+            return await self.__deal_note(
+                url,
+                i,
+                download,
+                index,
+                log,
+                bar,
+                context,
+                skip,
+            )
+        finally:
+            if claim:
+                try:
+                    await self.id_recorder.release(i, owner)
+                except RecordUnavailable as error:
+                    # 领取记录会在有效期结束后失效
+                    logging(log, str(error), ERROR)
+
+    async def __deal_note(
+        self,
+        url: str,
+        i: str,
+        download: bool,
+        index: list | tuple | None,
+        log,
+        bar,
+        context: "RequestContext" = None,
+        skip: bool = False,
+    ):
         logging(log, _("开始处理作品：{0}").format(i))
-        html = await self.html.request_url(
-            url,
-            log=log,
-            cookie=cookie,
-            proxy=proxy,
+        data = await self.cache.get(
+            context.cache_key(i) if context else i,
+            lambda: self.__fetch_note(url, i, log, context),
+        )
+        if not data:
+            METRICS.notes.inc(result="failure")
+            return {}
+        METRICS.notes.inc(result="success")
+        await self.update_author_nickname(data, log)
+        await self.__download_files(
+            data,
+            download,
+            index,
+            log,
+            bar,
+            context,
+            skip,
         )
+        logging(log, _("作品处理完成：{0}").format(i))
+        await sleep_time()
+        return data
+
+    async def __fetch_note(
+        self,
+        url: str,
+        i: str,
+        log,
+        context: "RequestContext" = None,
+    ) -> dict:
+        with METRICS.page.time():
+            html = await self.html.request_url(
+                url,
+                log=log,
+                cookie=context and context.cookie,
+                proxy=context and context.proxy,
+            )
         namespace = self.__generate_data_object(html)
         if not namespace:
             logging(log, _("{0} 获取数据失败").format(i), ERROR)
             return {}
-        data = self.explore.run(namespace)
+        with METRICS.extract.time():
+            data = self.explore.run(namespace)
         # logging(log, data)  # 调试代码
         if not data:
             logging(log, _("{0} 提取数据失败").format(i), ERROR)
@@ -323,10 +470,6 @@ class XHS:
         else:
             logging(log, _("未知的作品类型：{0}").format(i), WARNING)
             data["下载地址"] = []
-        await self.update_author_nickname(data, log)
-        await self.__download_files(data, download, index, log, bar)
-        logging(log, _("作品处理完成：{0}").format(i))
-        await sleep_time()
         return data
 
     async def update_author_nickname(
@@ -352,23 +495,28 @@ class XHS:
         return link.path.split("/")[-1]
 
     def __generate_data_object(self, html: str) -> Namespace:
-        data = self.convert.run(html)
-        return Namespace(data)
-
-    def __naming_rules(self, data: dict) -> str:
-        keys = self.manager.name_format.split()
-        values = []
-        for key in keys:
+        with METRICS.parse.time():
+            data = self.convert.run(html)
+            return Namespace(data)
+
+    def __compile_name_format(self, name_format: str) -> Callable[[dict], str]:
+        """将文件名称格式转换为取值函数，避免处理每个作品时重复解析"""
+        getters = []
+        for key in name_format.split():
             match key:
                 case "发布时间":
-                    values.append(self.__get_name_time(data))
+                    getters.append(self.__get_name_time)
                 case "作品标题":
-                    values.append(self.__get_name_title(data))
+                    getters.append(self.__get_name_title)
                 case _:
-                    values.append(data[key])
+                    getters.append(itemgetter(key))
+        separate = self.manager.SEPARATE
+        return lambda data: separate.join(getter(data) for getter in getters)
+
+    def __naming_rules(self, data: dict) -> str:
         return beautify_string(
             self.CLEANER.filter_name(
-                self.manager.SEPARATE.join(values),
+                self.__name_values(data),
                 default=self.manager.SEPARATE.join(
                     (
                         data["作者ID"],
@@ -399,7 +547,16 @@ class XHS:
         log=None,
         bar=None,
         data=True,
+        workers=MAX_WORKERS,
+        max_delay=8,
     ) -> None:
+        """
+        监听剪贴板并处理其中的作品链接
+
+        :param delay: 剪贴板读取间隔，剪贴板内容未变化时逐步延长至 max_delay
+        :param workers: 同时处理的作品数量
+        :param max_delay: 剪贴板读取间隔上限
+        """
         logging(
             None,
             _(
@@ -407,46 +564,71 @@ class XHS:
             ),
             style=MASTER,
         )
+        from pyperclip import copy
+
         self.event.clear()
+        self.queue = Queue()
+        self.monitor_ids.clear()
         copy("")
         await gather(
-            self.__get_link(delay),
-            self.__receive_link(delay, download, None, log, bar, data),
+            self.__get_link(delay, max(delay, max_delay), max(workers, 1)),
+            *[
+                self.__receive_link(download, None, log, bar, data)
+                for __ in range(max(workers, 1))
+            ],
         )
 
-    async def __get_link(self, delay: int):
+    async def __get_link(self, delay: float, max_delay: float, workers: int):
+        from pyperclip import paste
+
+        interval = delay
+        tasks = set()
         while not self.event.is_set():
-            if (t := paste()).lower() == "close":
+            if (t := await to_thread(paste)).lower() == "close":
                 self.stop_monitor()
+                break
             elif t != self.clipboard_cache:
                 self.clipboard_cache = t
-                create_task(self.__push_link(t))
-            await sleep(delay)
+                tasks.add(task := create_task(self.__push_link(t)))
+                task.add_done_callback(tasks.discard)
+                interval = delay
+            else:
+                # 剪贴板空闲时降低读取频率
+                interval = min(interval * 2, max_delay)
+            with suppress(TimeoutError):
+                await wait_for(self.event.wait(), interval)
+        await gather(*tasks)
+        for __ in range(workers):
+            self.queue.put_nowait(None)
 
     async def __push_link(
         self,
         content: str,
     ):
-        await gather(
-            *[self.queue.put(i) for i in await self.extract_links(content, None)]
-        )
+        for i in await self.extract_links(content, None):
+            if (id_ := self.__extract_link_id(i)) in self.monitor_ids:
+                continue
+            self.monitor_ids.add(id_)
+            self.queue.put_nowait(i)
 
-    async def __receive_link(self, delay: int, *args, **kwargs):
-        while not self.event.is_set() or self.queue.qsize() > 0:
-            with suppress(QueueEmpty):
-                await self.__deal_extract(self.queue.get_nowait(), *args, **kwargs)
-            await sleep(delay)
+    async def __receive_link(self, *args, **kwargs):
+        while (url := await self.queue.get()) is not None:
+            await self.__deal_extract(url, *args, **kwargs)
 
     def stop_monitor(self):
         self.event.set()
 
     async def skip_download(self, id_: str) -> bool:
-        return bool(await self.id_recorder.select(id_))
+        if result := bool(await self.id_recorder.select(id_)):
+            METRICS.skips.inc()
+        return result
 
     async def __aenter__(self):
+        await self.manager.check_proxy()
         await self.id_recorder.__aenter__()
         await self.data_recorder.__aenter__()
         await self.map_recorder.__aenter__()
+        await self.mapping.resume()
         return self
 
     async def __aexit__(self, exc_type, exc_value, traceback):
@@ -471,6 +653,26 @@ class XHS:
             else ""
         )
 
+    @staticmethod
+    def load_classifier(
+        value: bool | Callable[[str, str], tuple],
+    ) -> Callable[[str, str], tuple] | None:
+        """
+        创建记录作品数据时使用的作品分类器
+
+        :param value: 为 True 时使用内置的分类体系，也可以传入自定义的分类器
+        """
+        if callable(value):
+            return value
+        if not value:
+            return None
+        if not find_spec("jieba"):
+            logging(None, _("作品分类功能依赖 jieba，请先安装 jieba"), ERROR)
+            return None
+        from source.classifier import ContentClassifier, Taxonomy
+
+        return ContentClassifier(Taxonomy.load(cache=ROOT)).classify_content
+
     # @staticmethod
     # async def index(request):
     #     return web.HTTPFound(REPOSITORY)
@@ -518,28 +720,164 @@ class XHS:
     #     await self.runner.cleanup()
     #     logging(log, _("Web API 服务器已关闭！"))
 
-    async def run_server(
-        self,
-        host="0.0.0.0",
-        port=5556,
-        log_level="info",
-    ):
+    def create_app(self, lifespan=None) -> "FastAPI":
+        """
+        创建 Web API 应用
+
+        :param lifespan: 应用生命周期，多进程模式下由工作进程负责初始化与关闭 XHS 实例
+        """
+        from fastapi import FastAPI
+
         self.server = FastAPI(
             debug=self.VERSION_BETA,
             title="XHS-Downloader",
             version=__VERSION__,
+            lifespan=lifespan,
         )
         self.setup_routes()
+        METRICS.register(
+            Gauge(
+                "xhs_job_queue_depth",
+                "Jobs waiting for a worker",
+                lambda: self.jobs.depth,
+            )
+        )
+        METRICS.register(
+            Gauge(
+                "xhs_job_running",
+                "Jobs being processed",
+                lambda: len(self.jobs.running),
+            )
+        )
+        METRICS.register(
+            Counter(
+                "xhs_cache_hits_total",
+                "Note cache hits",
+                lambda: self.cache.hits,
+            )
+        )
+        METRICS.register(
+            Counter(
+                "xhs_cache_misses_total",
+                "Note cache misses",
+                lambda: self.cache.misses,
+            )
+        )
+        METRICS.register(
+            Counter(
+                "xhs_cache_coalesced_total",
+                "Note cache lookups that waited for a concurrent fetch",
+                lambda: self.cache.coalesced,
+            )
+        )
+        METRICS.register(
+            Gauge(
+                "xhs_cache_size",
+                "Notes in the cache",
+                lambda: len(self.cache.cache),
+            )
+        )
+        return self.server
+
+    @asynccontextmanager
+    async def serve_context(self, recover=True):
+        """启动 API 异步任务与作品数据缓存，退出时关闭"""
+        await self.jobs.start(recover)
+        try:
+            async with self.cache:
+                yield self
+        finally:
+            await self.jobs.stop()
+
+    async def run_server(
+        self,
+        host="0.0.0.0",
+        port=5556,
+        log_level="info",
+    ):
+        from uvicorn import Config, Server
+
         config = Config(
-            self.server,
+            self.create_app(),
             host=host,
             port=port,
             log_level=log_level,
         )
         server = Server(config)
-        await server.serve()
+        async with self.serve_context():
+            await server.serve()
+
+    async def __deal_request(
+        self,
+        url: str,
+        extract: "ExtractParams",
+    ) -> tuple[str, dict | None]:
+        if data := await self.__deal_extract(
+            url,
+            extract.download,
+            extract.index,
+            None,
+            None,
+            not extract.skip,
+            extract.context(),
+        ):
+            return _("获取小红书作品数据成功"), data
+        return _("获取小红书作品数据失败"), None
+
+    async def __deal_item(
+        self,
+        url: str,
+        extract: "ExtractParams",
+    ) -> "BatchData":
+        from source.module import BatchData
+
+        async with self.semaphore:
+            msg, data = await self.__deal_request(url, extract)
+        return BatchData(message=msg, url=url, data=data)
+
+    async def __deal_batch(
+        self,
+        urls: list[str],
+        extract: "ExtractParams",
+    ):
+        from source.module import BatchData
+
+        if not urls:
+            yield (
+                BatchData(
+                    message=_("提取小红书作品链接失败"),
+                    url=extract.url,
+                    data=None,
+                ).model_dump_json()
+                + "\n"
+            )
+            return
+        # 同一作品的不同分享链接可能携带不同的参数，按作品 ID 去重
+        links = {}
+        for i in urls:
+            links.setdefault(self.__extract_link_id(i), i)
+        tasks = [create_task(self.__deal_item(i, extract)) for i in links.values()]
+        try:
+            for task in as_completed(tasks):
+                yield (await task).model_dump_json() + "\n"
+        finally:
+            for task in tasks:
+                task.cancel()
 
     def setup_routes(self):
+        from fastapi import HTTPException
+        from fastapi.responses import (
+            PlainTextResponse,
+            RedirectResponse,
+            StreamingResponse,
+        )
+
+        from source.module import (
+            ExtractData,
+            ExtractParams,
+            JobData,
+        )
+
         @self.server.get("/")
         async def index():
             return RedirectResponse(url=REPOSITORY)
@@ -554,18 +892,105 @@ class XHS:
                 msg = _("提取小红书作品链接失败")
                 data = None
             else:
-                if data := await self.__deal_extract(
-                    url[0],
-                    extract.download,
-                    extract.index,
-                    None,
-                    None,
-                    not extract.skip,
-                    extract.cookie,
-                    extract.proxy,
-                ):
-                    msg = _("获取小红书作品数据成功")
-                else:
-                    msg = _("获取小红书作品数据失败")
-                    data = None
+                msg, data = await self.__deal_request(url[0], extract)
             return ExtractData(message=msg, params=extract, data=data)
+
+        @self.server.post("/xhs/batch")
+        async def handle_batch(extract: ExtractParams):
+            url = await self.extract_links(extract.url, None)
+            return StreamingResponse(
+                self.__deal_batch(url, extract),
+                media_type="application/x-ndjson",
+            )
+
+        @self.server.get("/metrics", response_class=PlainTextResponse)
+        async def metrics():
+            return PlainTextResponse(
+                METRICS.render(),
+                media_type="text/plain; version=0.0.4",
+            )
+
+        @self.server.get("/xhs/cache")
+        async def cache_statistics():
+            return self.cache.statistics()
+
+        @self.server.post("/xhs/job")
+        async def job_submit(extract: ExtractParams):
+            return {"id": await self.jobs.submit(extract)}
+
+        @self.server.get("/xhs/job/{id_}", response_model=JobData)
+        async def job_status(id_: str):
+            if not (job := await self.jobs.select(id_)):
+                raise HTTPException(status_code=404, detail=_("任务不存在"))
+            return JobData(**job)
+
+        @self.server.get("/xhs/job/{id_}/result")
+        async def job_result(id_: str):
+            if not (job := await self.jobs.select(id_)):
+                raise HTTPException(status_code=404, detail=_("任务不存在"))
+            return {
+                "id": id_,
+                "status": job["status"],
+                "data": await self.jobs.results(id_),
+            }
+
+        @self.server.delete("/xhs/job/{id_}")
+        async def job_cancel(id_: str):
+            return {"result": await self.jobs.cancel(id_)}
+
+        if self.record_token:
+            self.__setup_record_routes()
+
+    def __setup_record_routes(self):
+        """下载记录共享接口，请求需要携带 Authorization: Bearer 令牌"""
+        from fastapi import APIRouter, Depends, Header, HTTPException
+
+        from source.module import ClaimParams, RecordParams
+
+        token = f"Bearer {self.record_token}".encode()
+
+        async def verify(authorization: str = Header("")):
+            if not compare_digest(authorization.encode(), token):
+                raise HTTPException(status_code=401, detail=_("下载记录接口令牌无效"))
+
+        router = APIRouter(prefix="/record", dependencies=[Depends(verify)])
+
+        @router.get("/")
+        async def record_page(after: str = "", limit: int = IDRecorder.BATCH):
+            return {"ids": await self.id_recorder.page(after, limit)}
+
+        @router.get("/{id_}")
+        async def record_select(id_: str):
+            return {"exists": await self.skip_download(id_)}
+
+        @router.post("/")
+        async def record_add(record: RecordParams):
+            return {"count": await self.id_recorder.add_many(record.ids)}
+
+        @router.post("/delete")
+        async def record_delete(record: RecordParams):
+            count = await self.id_recorder.delete(record.ids) or 0
+            if record.author or record.pattern:
+                count += await self.id_recorder.delete_by(
+                    self.data_recorder.file,
+                    record.author,
+                    record.pattern,
+                )
+            return {"count": count}
+
+        @router.post("/claim")
+        async def record_claim(claim: ClaimParams):
+            return {
+                "result": await self.id_recorder.claim(
+                    claim.id,
+                    claim.owner,
+                    claim.lease,
+                )
+            }
+
+        @router.post("/release")
+        async def record_release(claim: ClaimParams):
+            await self.id_recorder.release(claim.id, claim.owner)
+            return {"result": True}
+
+        self.server.include_router(router)
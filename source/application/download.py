@@ -1,5 +1,6 @@
 from asyncio import Semaphore, gather
 from pathlib import Path
+from time import perf_counter
 from typing import TYPE_CHECKING, Any
 
 from aiofiles import open
@@ -13,6 +14,7 @@ from ..module import (
     FILE_SIGNATURES,
     FILE_SIGNATURES_LENGTH,
     MAX_WORKERS,
+    METRICS,
     logging,
     sleep_time,
 )
@@ -20,8 +22,6 @@ from ..module import retry as re_download
 from ..translation import _
 
 if TYPE_CHECKING:
-    from httpx import AsyncClient
-
     from ..module import Manager
 
 __all__ = ["Download"]
@@ -47,7 +47,6 @@ class Download:
         self.folder = manager.folder
         self.temp = manager.temp
         self.chunk = manager.chunk
-        self.client: "AsyncClient" = manager.download_client
         self.headers = manager.blank_headers
         self.retry = manager.retry
         self.folder_mode = manager.folder_mode
@@ -78,8 +77,10 @@ class Download:
         mtime: int,
         log,
         bar,
+        folder: Path = None,
+        proxy: str = None,
     ) -> tuple[Path, list[Any]]:
-        path = self.__generate_path(nickname, filename)
+        path = self.__generate_path(nickname, filename, folder or self.folder)
         if type_ == _("视频"):
             tasks = self.__ready_download_video(
                 urls,
@@ -107,18 +108,17 @@ class Download:
                 mtime,
                 log,
                 bar,
+                proxy,
             )
             for url, name, format_ in tasks
         ]
         tasks = await gather(*tasks)
         return path, tasks
 
-    def __generate_path(self, nickname: str, filename: str):
+    def __generate_path(self, nickname: str, filename: str, folder: Path):
         if self.author_archive:
-            folder = self.folder.joinpath(nickname)
+            folder = folder.joinpath(nickname)
             folder.mkdir(exist_ok=True)
-        else:
-            folder = self.folder
         path = self.manager.archive(folder, filename, self.folder_mode)
         path.mkdir(exist_ok=True)
         return path
@@ -205,6 +205,7 @@ class Download:
         mtime: int,
         log,
         bar,
+        proxy: str = None,
     ):
         async with self.SEMAPHORE:
             headers = self.headers.copy()
@@ -213,6 +214,7 @@ class Download:
             #         url,
             #         headers,
             #         format_,
+            #         proxy,
             #     )
             # except HTTPError as error:
             #     logging(
@@ -228,28 +230,32 @@ class Download:
                 headers,
                 temp,
             )
+            METRICS.active.inc()
+            start = perf_counter()
             try:
-                async with self.client.stream(
-                    "GET",
-                    url,
-                    headers=headers,
-                ) as response:
-                    await sleep_time()
-                    if response.status_code == 416:
-                        raise CacheError(
-                            _("文件 {0} 缓存异常，重新下载").format(temp.name),
-                        )
-                    response.raise_for_status()
-                    # self.__create_progress(
-                    #     bar,
-                    #     int(
-                    #         response.headers.get(
-                    #             'content-length', 0)) or None,
-                    # )
-                    async with open(temp, "ab") as f:
-                        async for chunk in response.aiter_bytes(self.chunk):
-                            await f.write(chunk)
-                            # self.__update_progress(bar, len(chunk))
+                with self.manager.borrow(proxy, True) as client:
+                    async with client.stream(
+                        "GET",
+                        url,
+                        headers=headers,
+                    ) as response:
+                        await sleep_time()
+                        if response.status_code == 416:
+                            raise CacheError(
+                                _("文件 {0} 缓存异常，重新下载").format(temp.name),
+                            )
+                        response.raise_for_status()
+                        # self.__create_progress(
+                        #     bar,
+                        #     int(
+                        #         response.headers.get(
+                        #             'content-length', 0)) or None,
+                        # )
+                        async with open(temp, "ab") as f:
+                            async for chunk in response.aiter_bytes(self.chunk):
+                                await f.write(chunk)
+                                METRICS.bytes.inc(len(chunk))
+                                # self.__update_progress(bar, len(chunk))
                 real = await self.__suffix_with_file(
                     temp,
                     path,
@@ -266,7 +272,7 @@ class Download:
                 )
                 # self.__create_progress(bar, None)
                 logging(log, _("文件 {0} 下载成功").format(real.name))
-                return True
+                return real
             except HTTPError as error:
                 # self.__create_progress(bar, None)
                 logging(
@@ -284,6 +290,9 @@ class Download:
                     str(error),
                     ERROR,
                 )
+            finally:
+                METRICS.active.dec()
+                METRICS.download.observe(perf_counter() - start)
 
     @staticmethod
     def __create_progress(
@@ -308,11 +317,13 @@ class Download:
         url: str,
         headers: dict[str, str],
         suffix: str,
+        proxy: str = None,
     ) -> tuple[int, str]:
-        response = await self.client.head(
-            url,
-            headers=headers,
-        )
+        with self.manager.borrow(proxy, True) as client:
+            response = await client.head(
+                url,
+                headers=headers,
+            )
         await sleep_time()
         response.raise_for_status()
         suffix = self.__extract_type(response.headers.get("Content-Type")) or suffix
@@ -0,0 +1,153 @@
+from asyncio import (
+    CancelledError,
+    Event,
+    Task,
+    TimeoutError,
+    create_task,
+    gather,
+    sleep,
+    wait_for,
+)
+from contextlib import suppress
+from pathlib import Path
+from typing import TYPE_CHECKING, Awaitable, Callable
+from uuid import uuid4
+
+from ..module import (
+    ERROR,
+    MAX_WORKERS,
+    WARNING,
+    JobRecorder,
+    logging,
+)
+from ..translation import _
+
+if TYPE_CHECKING:
+    from ..module import BatchData, ExtractParams
+
+__all__ = ["JobManager"]
+
+
+class JobManager:
+    """
+    使用固定数量的协程执行 API 异步任务
+
+    任务记录储存于共享的数据库，多个服务器进程可以同时领取任务，
+    任意进程均可查询或取消其他进程正在处理的任务
+    """
+
+    INTERVAL = 1
+
+    def __init__(
+        self,
+        file: Path,
+        extract: Callable[[str, None], Awaitable[list[str]]],
+        handler: Callable[[str, "ExtractParams"], Awaitable["BatchData"]],
+        owner: str,
+        workers: int = MAX_WORKERS,
+    ):
+        self.recorder = JobRecorder(file)
+        self.extract = extract
+        self.handler = handler
+        self.owner = owner
+        self.workers = max(workers, 1)
+        self.event = Event()
+        self.depth = 0
+        self.running: dict[str, Task] = {}
+        self.tasks: list[Task] = []
+
+    async def start(self, recover=True) -> None:
+        """
+        启动任务协程
+
+        :param recover: 是否恢复中断的任务，多进程模式下由主进程在启动工作进程前恢复
+        """
+        await self.recorder.__aenter__()
+        if recover and (count := await self.recorder.recover()):
+            logging(None, _("已恢复 {0} 个中断的任务").format(count), WARNING)
+        self.tasks = [create_task(self.__work()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self.tasks:
+            task.cancel()
+        await gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+        await self.recorder.__aexit__(None, None, None)
+
+    async def submit(self, extract: "ExtractParams") -> str:
+        id_ = uuid4().hex
+        await self.recorder.add(id_, extract.model_dump())
+        self.event.set()
+        return id_
+
+    async def select(self, id_: str) -> dict | None:
+        return await self.recorder.select(id_)
+
+    async def results(self, id_: str) -> list[dict]:
+        return await self.recorder.results(id_)
+
+    async def cancel(self, id_: str) -> bool:
+        if result := await self.recorder.cancel(id_):
+            if task := self.running.get(id_):
+                task.cancel()
+        return result
+
+    async def __wait(self) -> None:
+        self.event.clear()
+        self.depth = await self.recorder.pending()
+        # 其他进程提交的任务无法触发事件，超时后重新查询任务记录
+        with suppress(TimeoutError):
+            await wait_for(self.event.wait(), self.INTERVAL)
+
+    async def __work(self) -> None:
+        while True:
+            if not (job := await self.recorder.claim(self.owner)):
+                await self.__wait()
+                continue
+            id_, params = job
+            self.running[id_] = task = create_task(self.__run(id_, params))
+            heartbeat = create_task(self.__heartbeat(id_, task))
+            try:
+                await gather(task, return_exceptions=True)
+            except CancelledError:
+                task.cancel()
+                raise
+            finally:
+                heartbeat.cancel()
+                self.running.pop(id_, None)
+
+    async def __heartbeat(self, id_: str, task: Task) -> None:
+        """定期续期任务租约，任务被取消或被其他进程重新领取时停止处理"""
+        while True:
+            await sleep(JobRecorder.LEASE / 3)
+            if not await self.recorder.heartbeat(id_, self.owner):
+                task.cancel()
+                return
+
+    async def __run(self, id_: str, params: dict) -> None:
+        from ..module import ExtractParams
+
+        try:
+            extract = ExtractParams(**params)
+            urls = list(dict.fromkeys(await self.extract(extract.url, None)))
+            await self.recorder.update(id_, total=len(urls))
+            finished = await self.recorder.finished(id_)
+            for url in urls:
+                if url in finished:
+                    continue
+                # 任务可能已被其他进程取消或重新领取
+                if not await self.recorder.heartbeat(id_, self.owner):
+                    return
+                item = await self.handler(url, extract)
+                await self.recorder.add_result(id_, url, item.message, item.data)
+        except CancelledError:
+            raise
+        except Exception as error:
+            logging(None, _("任务 {0} 处理失败：{1}").format(id_, repr(error)), ERROR)
+            await self.recorder.update(id_, JobRecorder.FAILURE)
+            return
+        if await self.recorder.heartbeat(id_, self.owner):
+            await self.recorder.update(
+                id_,
+                JobRecorder.SUCCESS if urls else JobRecorder.FAILURE,
+            )
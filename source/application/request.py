@@ -1,7 +1,6 @@
 from typing import TYPE_CHECKING
 
 from httpx import HTTPError
-from httpx import get
 
 from ..module import ERROR, Manager, logging, retry, sleep_time
 from ..translation import _
@@ -18,7 +17,7 @@ class Html:
         manager: "Manager",
     ):
         self.retry = manager.retry
-        self.client = manager.request_client
+        self.manager = manager
         self.headers = manager.headers
         self.timeout = manager.timeout
 
@@ -80,7 +79,7 @@ class Html:
         headers: dict,
         **kwargs,
     ):
-        return await self.client.head(
+        return await self.manager.client().head(
             url,
             headers=headers,
             **kwargs,
@@ -93,15 +92,12 @@ class Html:
         proxy: str,
         **kwargs,
     ):
-        return await self.client.head(
-            url,
-            headers=headers,
-            proxy=proxy,
-            follow_redirects=True,
-            verify=False,
-            timeout=self.timeout,
-            **kwargs,
-        )
+        with self.manager.borrow(proxy) as client:
+            return await client.head(
+                url,
+                headers=headers,
+                **kwargs,
+            )
 
     async def __request_url_get(
         self,
@@ -109,7 +105,7 @@ class Html:
         headers: dict,
         **kwargs,
     ):
-        return await self.client.get(
+        return await self.manager.client().get(
             url,
             headers=headers,
             **kwargs,
@@ -122,12 +118,9 @@ class Html:
         proxy: str,
         **kwargs,
     ):
-        return get(
-            url,
-            headers=headers,
-            proxy=proxy,
-            follow_redirects=True,
-            verify=False,
-            timeout=self.timeout,
-            **kwargs,
-        )
+        with self.manager.borrow(proxy) as client:
+            return await client.get(
+                url,
+                headers=headers,
+                **kwargs,
+            )
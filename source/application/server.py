@@ -0,0 +1,59 @@
+from asyncio import run
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
+
+from ..module import MASTER, ROOT, WARNING, JobRecorder, Settings, logging
+from ..translation import _
+from .app import XHS
+
+if TYPE_CHECKING:
+    from fastapi import FastAPI
+
+__all__ = ["create_app", "run_workers"]
+
+
+def create_app() -> "FastAPI":
+    """
+    工作进程的应用工厂，每个工作进程持有独立的 XHS 实例
+
+    下载记录、作品处理权与 API 异步任务通过 ROOT 目录下的共享数据库协调
+    """
+    xhs = XHS(**Settings().run() | {"_print": False})
+
+    @asynccontextmanager
+    async def lifespan(app: "FastAPI"):
+        async with xhs, xhs.serve_context(False):
+            yield
+
+    return xhs.create_app(lifespan)
+
+
+async def recover(log=None) -> None:
+    async with JobRecorder(ROOT.joinpath("TaskQueue.db")) as recorder:
+        if count := await recorder.recover():
+            logging(log, _("已恢复 {0} 个中断的任务").format(count), WARNING)
+
+
+def run_workers(
+    host="0.0.0.0",
+    port=5556,
+    log_level="info",
+    workers: int = 2,
+) -> None:
+    """
+    使用多个工作进程运行 Web API 服务器
+
+    :param workers: 工作进程数量
+    """
+    from uvicorn import run as serve
+
+    run(recover())
+    logging(None, _("启动 {0} 个 Web API 工作进程").format(workers), MASTER)
+    serve(
+        "source.application.server:create_app",
+        factory=True,
+        host=host,
+        port=port,
+        log_level=log_level,
+        workers=workers,
+    )
@@ -0,0 +1,118 @@
+from asyncio import Event, TimeoutError, gather, wait_for
+from contextlib import suppress
+from json import JSONDecodeError, loads
+from pathlib import Path
+
+from aiofiles import open as async_open
+
+from ..module import MASTER, MAX_WORKERS, ROOT, WARNING, TaskQueue, logging
+from ..translation import _
+from .app import XHS
+
+__all__ = ["Watcher"]
+
+
+class Watcher:
+    """
+    持续读取文本文件或文件夹中的作品链接并下载作品
+
+    新增的作品链接写入持久化任务队列，每个文件的读取进度与任务在同一事务内保存，
+    程序重新运行时从上次中断的位置继续读取和处理
+    """
+
+    SUFFIX = {".txt", ".ndjson", ".jsonl"}
+
+    def __init__(
+        self,
+        xhs: XHS,
+        path: Path,
+        workers: int = MAX_WORKERS,
+        interval: float = 1,
+        file: Path = ROOT.joinpath("TaskQueue.db"),
+    ):
+        self.xhs = xhs
+        self.path = path
+        self.workers = max(workers, 1)
+        self.interval = interval
+        self.file = file
+        self.event = Event()
+
+    async def run(self, log=None) -> None:
+        async with TaskQueue(self.file) as queue:
+            if count := await queue.recover():
+                logging(log, _("已恢复 {0} 个中断的作品任务").format(count), WARNING)
+            logging(
+                log,
+                _("开始监听 {0}，新增的作品链接将自动下载").format(self.path),
+                MASTER,
+            )
+            await gather(
+                self.__watch(queue, log),
+                *[self.__work(queue, log) for __ in range(self.workers)],
+            )
+
+    def stop(self) -> None:
+        self.event.set()
+
+    def __files(self) -> list[Path]:
+        if self.path.is_file():
+            return [self.path]
+        return sorted(
+            i
+            for i in self.path.iterdir()
+            if i.is_file() and i.suffix.lower() in self.SUFFIX
+        )
+
+    async def __watch(self, queue: TaskQueue, log) -> None:
+        while not self.event.is_set():
+            for file in self.__files():
+                await self.__read(queue, file, log)
+            await self.__wait()
+
+    async def __read(self, queue: TaskQueue, file: Path, log) -> None:
+        source = str(file.resolve())
+        offset = await queue.offset(source)
+        if (size := file.stat().st_size) < offset:
+            # 文件被截断或替换，从头读取
+            offset = 0
+        if size == offset:
+            return
+        async with async_open(file, "rb") as f:
+            await f.seek(offset)
+            content = await f.read(size - offset)
+        # 仅读取完整的行，未写完的行留待下次读取
+        if not (end := content.rfind(b"\n") + 1):
+            return
+        urls = []
+        for line in content[:end].decode("utf-8", errors="ignore").splitlines():
+            if line := self.__parse_line(line):
+                urls.extend(await self.xhs.extract_links(line, log))
+        if count := await queue.put(urls, source, offset + end):
+            logging(log, _("新增 {0} 个小红书作品任务").format(count))
+
+    @staticmethod
+    def __parse_line(line: str) -> str:
+        """支持纯文本与 NDJSON 格式，NDJSON 读取每行对象的 url 字段"""
+        if (line := line.strip()).startswith("{"):
+            with suppress(JSONDecodeError, AttributeError):
+                return str(loads(line).get("url") or "")
+        return line
+
+    async def __work(self, queue: TaskQueue, log) -> None:
+        while True:
+            if not (tasks := await queue.claim(self.xhs.owner, size=1)):
+                if self.event.is_set():
+                    return
+                await self.__wait()
+                continue
+            for id_, url in tasks:
+                await queue.heartbeat(self.xhs.owner)
+                result = await self.xhs.extract(url, True, log=log, data=False)
+                await queue.finish(
+                    id_,
+                    result[0] if result else None,
+                )
+
+    async def __wait(self) -> None:
+        with suppress(TimeoutError):
+            await wait_for(self.event.wait(), self.interval)
@@ -0,0 +1,119 @@
+from asyncio import CancelledError, run, to_thread
+from contextlib import suppress
+from multiprocessing import get_context
+from pathlib import Path
+from secrets import token_hex
+from typing import Iterable
+
+from ..module import MASTER, MAX_WORKERS, ROOT, WARNING, TaskQueue, logging
+from ..translation import _
+from .app import XHS
+
+__all__ = ["Coordinator"]
+
+
+class Coordinator:
+    """
+    多进程批量处理作品：协调进程将作品链接写入持久化任务队列，
+    每个工作进程运行独立的 XHS 实例领取并处理任务，
+    处理结果写回任务队列，下载记录通过共享的 ExploreID.db 合并
+    """
+
+    def __init__(
+        self,
+        parameter: dict,
+        workers: int = MAX_WORKERS,
+        file: Path = ROOT.joinpath("TaskQueue.db"),
+    ):
+        self.parameter = parameter
+        self.workers = max(workers, 1)
+        self.file = file
+
+    async def put(self, xhs: XHS, lines: Iterable[str], log=None) -> int:
+        urls = []
+        for line in lines:
+            urls.extend(await xhs.extract_links(line, log))
+        async with TaskQueue(self.file) as queue:
+            count = await queue.put(urls)
+        logging(log, _("新增 {0} 个小红书作品任务").format(count))
+        return count
+
+    async def put_file(self, xhs: XHS, file: Path, log=None) -> int:
+        with file.open("r", encoding="utf-8") as f:
+            return await self.put(xhs, f, log)
+
+    async def run(self, log=None) -> dict[int, int]:
+        async with TaskQueue(self.file) as queue:
+            if count := await queue.recover():
+                logging(log, _("已恢复 {0} 个中断的作品任务").format(count), WARNING)
+        logging(
+            log,
+            _("启动 {0} 个工作进程处理作品任务").format(self.workers),
+            MASTER,
+        )
+        # 工作进程的领取者标识以本次运行的标识开头，用于统计本次运行处理的任务
+        run_id = f"{token_hex(4)}_"
+        context = get_context("spawn")
+        processes = [
+            context.Process(
+                target=work,
+                args=(
+                    self.parameter,
+                    i,
+                    self.workers,
+                    self.file,
+                    run_id,
+                ),
+                daemon=True,
+            )
+            for i in range(self.workers)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            await to_thread(process.join)
+        async with TaskQueue(self.file) as queue:
+            statistics = await queue.statistics(run_id)
+        logging(
+            log,
+            _("作品任务处理完成，成功 {0} 个，失败 {1} 个").format(
+                statistics.get(TaskQueue.SUCCESS, 0),
+                statistics.get(TaskQueue.FAILURE, 0),
+            ),
+            MASTER,
+        )
+        return statistics
+
+
+def work(
+    parameter: dict,
+    shard: int,
+    shards: int,
+    file: Path,
+    run_id: str = "",
+) -> None:
+    with suppress(KeyboardInterrupt, CancelledError):
+        run(_work(parameter, shard, shards, file, run_id))
+
+
+async def _work(
+    parameter: dict,
+    shard: int,
+    shards: int,
+    file: Path,
+    run_id: str,
+) -> None:
+    async with (
+        XHS(**parameter | {"_print": not shard}) as xhs,
+        TaskQueue(file) as queue,
+    ):
+        owner = run_id + xhs.owner
+        while tasks := await queue.claim(owner, shard, shards):
+            for id_, url in tasks:
+                # 续期同一批次中尚未处理的任务，避免被其他进程重新领取
+                await queue.heartbeat(owner)
+                result = await xhs.extract(url, True, data=False)
+                await queue.finish(
+                    id_,
+                    result[0] if result else None,
+                )
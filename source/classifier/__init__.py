@@ -0,0 +1,16 @@
+from .cache import FeatureCache
+from .engine import ContentClassifier
+from .matcher import KeywordMatcher
+from .matrix import CategoryMatrix
+from .runner import CategoryWriter, DataClassifier
+from .taxonomy import Taxonomy
+
+__all__ = [
+    "CategoryMatrix",
+    "CategoryWriter",
+    "ContentClassifier",
+    "DataClassifier",
+    "FeatureCache",
+    "KeywordMatcher",
+    "Taxonomy",
+]
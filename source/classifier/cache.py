@@ -0,0 +1,73 @@
+from hashlib import blake2b
+from pathlib import Path
+from sqlite3 import connect
+from threading import Lock
+
+__all__ = ["FeatureCache"]
+
+
+class FeatureCache:
+    """
+    jieba 关键词提取结果的持久化缓存
+
+    以规范化文本的哈希值为键，调整分类体系后重新分类无需再次分词；
+    新增的提取结果累积到 flush_size 条后批量写入
+    """
+
+    # 关键词提取参数变化时需要修改版本，避免读取到旧参数的提取结果
+    VERSION = b"extract_tags:topK=20"
+    SEPARATOR = "\t"
+
+    def __init__(self, file: Path, flush_size: int = 1000):
+        self.file = file
+        self.flush_size = flush_size
+        self.pending: dict[bytes, str] = {}
+        self.lock = Lock()
+        self.database = connect(file, timeout=30, check_same_thread=False)
+        self.database.execute("PRAGMA journal_mode=WAL;")
+        self.database.execute(
+            "CREATE TABLE IF NOT EXISTS feature_cache ("
+            "HASH BLOB PRIMARY KEY,"
+            "TOKENS TEXT NOT NULL"
+            ") WITHOUT ROWID;"
+        )
+        self.database.commit()
+
+    @classmethod
+    def key(cls, text: str) -> bytes:
+        return blake2b(cls.VERSION + text.encode("utf-8"), digest_size=16).digest()
+
+    def get(self, key: bytes) -> list[str] | None:
+        with self.lock:
+            if (tokens := self.pending.get(key)) is None:
+                row = self.database.execute(
+                    "SELECT TOKENS FROM feature_cache WHERE HASH=?;",
+                    (key,),
+                ).fetchone()
+                if not row:
+                    return None
+                tokens = row[0]
+        return tokens.split(self.SEPARATOR) if tokens else []
+
+    def put(self, key: bytes, tokens: list[str]) -> None:
+        with self.lock:
+            self.pending[key] = self.SEPARATOR.join(tokens)
+            if len(self.pending) >= self.flush_size:
+                self.__flush()
+
+    def flush(self) -> None:
+        with self.lock:
+            self.__flush()
+
+    def __flush(self) -> None:
+        if self.pending:
+            with self.database:
+                self.database.executemany(
+                    "INSERT OR IGNORE INTO feature_cache VALUES (?, ?);",
+                    self.pending.items(),
+                )
+            self.pending.clear()
+
+    def close(self) -> None:
+        self.flush()
+        self.database.close()
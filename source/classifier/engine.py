@@ -0,0 +1,108 @@
+from collections import Counter
+from importlib import import_module
+from pathlib import Path
+from time import perf_counter
+
+from .cache import FeatureCache
+from .matrix import CategoryMatrix
+from .taxonomy import Taxonomy
+
+__all__ = ["ContentClassifier"]
+
+
+class ContentClassifier:
+    """
+    作品分类器，根据作品标题与作品标签将作品分类至二级分类体系
+
+    依赖 jieba 提取关键词；安装 NumPy 与 SciPy 时，批量分类使用稀疏矩阵计算分数
+    """
+
+    TOP_K = 20
+
+    def __init__(self, taxonomy: Taxonomy = None, feature_cache: Path = None):
+        """
+        :param taxonomy: 分类体系，默认使用内置的分类体系
+        :param feature_cache: jieba 关键词提取结果缓存文件，为空时不缓存
+        """
+        jieba = import_module("jieba")
+        jieba.initialize()
+        self.extract_tags = import_module("jieba.analyse").extract_tags
+        self.taxonomy = taxonomy or Taxonomy.load()
+        self.matrix = (
+            CategoryMatrix(self.taxonomy.keyword_index)
+            if CategoryMatrix.available
+            else None
+        )
+        self.feature_cache = FeatureCache(feature_cache) if feature_cache else None
+        # 各阶段累计耗时，单位：秒
+        self.timings = Counter()
+
+    def extract_features(self, title: str, content: str = "") -> list[str]:
+        """提取 jieba 关键词与作品文本中出现的分类关键词"""
+        start = perf_counter()
+        # 合并连续空白字符，相同内容的作品可复用关键词提取结果
+        text = " ".join(f"{title} {content}".split())
+        tags = self.__extract_tags(text)
+        middle = perf_counter()
+        features = self.taxonomy.matcher.find(text).union(tags)
+        self.timings["tokenize"] += middle - start
+        self.timings["match"] += perf_counter() - middle
+        return list(features)
+
+    def __extract_tags(self, text: str) -> list[str]:
+        if not self.feature_cache:
+            return self.extract_tags(text, topK=self.TOP_K)
+        key = self.feature_cache.key(text)
+        if (tags := self.feature_cache.get(key)) is None:
+            tags = self.extract_tags(text, topK=self.TOP_K)
+            self.feature_cache.put(key, tags)
+        return tags
+
+    def score(self, features: list[str]) -> dict[tuple[int, int], int]:
+        """计算每个分类的匹配分数"""
+        scores = {}
+        keyword_index = self.taxonomy.keyword_index
+        for feature in features:
+            for key in keyword_index.get(feature, ()):
+                scores[key] = scores.get(key, 0) + 1
+        return scores
+
+    def classify_content(
+        self,
+        title: str,
+        content: str = "",
+    ) -> tuple[int, int, str, str]:
+        """对单个作品进行分类，返回 (类别1_ID, 类别2_ID, 类别1, 类别2)"""
+        features = self.extract_features(title, content)
+        start = perf_counter()
+        if scores := self.score(features):
+            # 分数相同时选择分类体系中靠前的分类，与批量分类的结果保持一致
+            result = self.taxonomy.result(*min(scores, key=lambda i: (-scores[i], i)))
+        else:
+            result = self.taxonomy.default
+        self.timings["score"] += perf_counter() - start
+        return result
+
+    def classify_batch(
+        self,
+        records: list[tuple[str, str]],
+    ) -> list[tuple[int, int, str, str]]:
+        """批量分类 (作品标题, 作品标签)"""
+        if self.matrix:
+            features = [self.extract_features(*i) for i in records]
+            start = perf_counter()
+            results = [
+                self.taxonomy.result(*i) if i else self.taxonomy.default
+                for i in self.matrix.best(features)
+            ]
+            self.timings["score"] += perf_counter() - start
+        else:
+            results = [self.classify_content(*i) for i in records]
+        if self.feature_cache:
+            self.feature_cache.flush()
+        return results
+
+    def close(self) -> None:
+        """写入尚未保存的关键词提取结果"""
+        if self.feature_cache:
+            self.feature_cache.close()
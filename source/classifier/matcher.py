@@ -0,0 +1,86 @@
+__all__ = ["KeywordMatcher"]
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick 多模式匹配自动机
+
+    构建一次后，单次遍历文本即可找出所有出现过的关键词，包括相互重叠的关键词
+    """
+
+    def __init__(self, keywords):
+        # 状态 0 为根节点；transitions 保存每个状态的非根转移，
+        # 包括通过失败指针继承的转移，匹配时无需回溯失败链
+        self.transitions: list[dict[str, int]] = [{}]
+        self.outputs: list[tuple[str, ...]] = [()]
+        for keyword in keywords:
+            if keyword:
+                self.__insert(keyword)
+        self.__build()
+
+    def __insert(self, keyword: str) -> None:
+        state = 0
+        for char in keyword:
+            if char not in self.transitions[state]:
+                self.transitions.append({})
+                self.outputs.append(())
+                self.transitions[state][char] = len(self.transitions) - 1
+            state = self.transitions[state][char]
+        if keyword not in self.outputs[state]:
+            self.outputs[state] += (keyword,)
+
+    def __build(self) -> None:
+        """按广度优先顺序计算失败指针，合并输出与转移"""
+        goto = [dict(i) for i in self.transitions]
+        fail = [0] * len(goto)
+        order = []
+        pending = list(goto[0].values())
+        while pending:
+            order.extend(pending)
+            following = []
+            for state in pending:
+                for char, child in goto[state].items():
+                    node = fail[state]
+                    while node and char not in goto[node]:
+                        node = fail[node]
+                    fail[child] = goto[node].get(char, 0) if state else 0
+                    following.append(child)
+            pending = following
+        for state in order:
+            link = fail[state]
+            self.outputs[state] = self.outputs[state] + tuple(
+                i for i in self.outputs[link] if i not in self.outputs[state]
+            )
+            if link:
+                self.transitions[state] = {
+                    **self.transitions[link],
+                    **goto[state],
+                }
+
+    def dump(self) -> dict:
+        """导出自动机的转移与输出，可写入 JSON 文件"""
+        return {
+            "transitions": self.transitions,
+            "outputs": self.outputs,
+        }
+
+    @classmethod
+    def load(cls, data: dict) -> "KeywordMatcher":
+        """根据 dump 的导出结果恢复自动机，无需重新构建"""
+        matcher = cls(())
+        matcher.transitions = data["transitions"]
+        matcher.outputs = [tuple(i) for i in data["outputs"]]
+        return matcher
+
+    def find(self, text: str) -> set[str]:
+        """返回文本中出现过的全部关键词"""
+        transitions = self.transitions
+        outputs = self.outputs
+        root = transitions[0]
+        found = set()
+        state = 0
+        for char in text:
+            state = transitions[state].get(char) or root.get(char, 0)
+            if outputs[state]:
+                found.update(outputs[state])
+        return found
@@ -0,0 +1,57 @@
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:
+    np = sparse = None
+
+__all__ = ["CategoryMatrix"]
+
+
+class CategoryMatrix:
+    """
+    关键词-分类稀疏矩阵，通过一次稀疏矩阵乘法计算整批作品的分类分数
+
+    依赖 NumPy 与 SciPy，未安装时 available 为 False；分数相同时选择分类体系中靠前的分类
+    """
+
+    available = sparse is not None
+
+    def __init__(self, keyword_index: dict[str, list[tuple[int, int]]]):
+        self.categories = sorted({i for j in keyword_index.values() for i in j})
+        columns = {j: i for i, j in enumerate(self.categories)}
+        self.keyword_ids = {j: i for i, j in enumerate(keyword_index)}
+        rows, cols = zip(
+            *(
+                (self.keyword_ids[keyword], columns[category])
+                for keyword, categories in keyword_index.items()
+                for category in categories
+            )
+        )
+        # 同一关键词在同一分类中重复出现时累加，与逐条计算的结果一致
+        self.matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (rows, cols)),
+            shape=(len(self.keyword_ids), len(self.categories)),
+        )
+
+    def best(self, batch: list[list[str]]) -> list[tuple[int, int] | None]:
+        """返回每个作品分数最高的分类，没有匹配任何关键词时返回 None"""
+        if not batch:
+            return []
+        indptr = [0]
+        indices = []
+        for features in batch:
+            indices.extend(
+                i for j in features if (i := self.keyword_ids.get(j)) is not None
+            )
+            indptr.append(len(indices))
+        notes = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.int32), indices, indptr),
+            shape=(len(batch), len(self.keyword_ids)),
+        )
+        scores = (notes @ self.matrix).toarray()
+        best = scores.argmax(axis=1)
+        matched = scores[np.arange(len(batch)), best] > 0
+        return [
+            self.categories[i] if j else None
+            for i, j in zip(best.tolist(), matched.tolist())
+        ]
@@ -0,0 +1,317 @@
+from collections import Counter
+from contextlib import closing, nullcontext
+from multiprocessing import get_context
+from pathlib import Path
+from queue import Empty, Queue
+from sqlite3 import Connection, Error, connect
+from threading import Thread
+from time import perf_counter
+from typing import Iterator
+
+from ..module import ERROR, GENERAL, MASTER, WARNING, DataRecorder, logging
+from ..translation import _
+from .engine import ContentClassifier
+from .taxonomy import Taxonomy
+
+__all__ = ["DataClassifier", "CategoryWriter"]
+
+# 未分类作品的判断条件，与部分索引的表达式保持一致以便查询使用索引
+UNCLASSIFIED_KEY = "COALESCE(类别1, '')"
+UNCLASSIFIED = f"{UNCLASSIFIED_KEY} = ''"
+
+
+class CategoryWriter:
+    """
+    分类结果写入线程
+
+    持有唯一的数据库连接，从队列接收分类结果，累积到 commit_size 条或队列空闲时以单个事务提交
+    """
+
+    def __init__(
+        self,
+        file: Path,
+        table: str = DataRecorder.TABLE,
+        commit_size: int = 5000,
+        commit_interval: float = 1,
+    ):
+        self.file = file
+        self.table = table
+        self.commit_size = commit_size
+        self.commit_interval = commit_interval
+        self.queue = Queue(maxsize=64)
+        self.written = 0
+        self.elapsed = 0.0
+        self.error: Error | None = None
+        self.thread = Thread(target=self.__run, name="CategoryWriter", daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.queue.put(None)
+        self.thread.join()
+        if self.error and not exc_type:
+            raise self.error
+
+    def put(self, updates: list[tuple[int, int, int, str, str]]) -> None:
+        """提交分类结果，元素为 (rowid, 类别1_ID, 类别2_ID, 类别1, 类别2)"""
+        if self.error:
+            raise self.error
+        if updates:
+            self.queue.put(updates)
+
+    def __run(self) -> None:
+        database = connect(self.file, timeout=30)
+        database.execute("PRAGMA journal_mode=WAL;")
+        sql = (
+            f"UPDATE {self.table} SET "
+            "类别1_ID=?2, 类别2_ID=?3, 类别1=?4, 类别2=?5 WHERE rowid=?1;"
+        )
+        pending = []
+        try:
+            while True:
+                try:
+                    updates = self.queue.get(timeout=self.commit_interval)
+                except Empty:
+                    updates = []
+                if updates is None:
+                    break
+                if self.error:
+                    # 写入失败后继续取出结果，避免提交结果的线程被阻塞
+                    continue
+                pending.extend(updates)
+                if pending and (not updates or len(pending) >= self.commit_size):
+                    self.__commit(database, sql, pending)
+                    pending = []
+            if pending and not self.error:
+                self.__commit(database, sql, pending)
+        finally:
+            database.close()
+
+    def __commit(self, database: Connection, sql: str, updates: list) -> None:
+        start = perf_counter()
+        try:
+            with database:
+                database.executemany(sql, updates)
+            self.written += len(updates)
+        except Error as error:
+            self.error = error
+        self.elapsed += perf_counter() - start
+
+
+class RangeClassifier:
+    """读取并分类 rowid 区间内的作品，多进程分类时每个进程持有独立的实例"""
+
+    def __init__(
+        self,
+        file: Path,
+        table: str,
+        condition: str,
+        taxonomy: Taxonomy,
+        feature_cache: Path | None,
+    ):
+        self.classifier = ContentClassifier(taxonomy, feature_cache)
+        self.database = connect(file, timeout=30)
+        self.sql = (
+            f"SELECT rowid, 作品标题, 作品标签 FROM {table} "
+            f"WHERE {condition} AND rowid BETWEEN ? AND ?;"
+        )
+
+    def __call__(
+        self,
+        rowid_range: tuple[int, int],
+    ) -> tuple[list[tuple[int, int, int, str, str]], Counter]:
+        """返回分类结果与本次分类的各阶段耗时"""
+        start = perf_counter()
+        rows = self.database.execute(self.sql, rowid_range).fetchall()
+        self.classifier.timings["read"] += perf_counter() - start
+        results = self.classifier.classify_batch(
+            [(i[1] or "", i[2] or "") for i in rows]
+        )
+        timings, self.classifier.timings = self.classifier.timings, Counter()
+        return [(i[0], *j) for i, j in zip(rows, results)], timings
+
+    def close(self) -> None:
+        self.classifier.close()
+        self.database.close()
+
+
+# 多进程分类时每个工作进程持有的分类器
+_worker: RangeClassifier | None = None
+
+
+def _init_worker(*args) -> None:
+    global _worker
+    _worker = RangeClassifier(*args)
+
+
+def _classify_range(rowid_range: tuple[int, int]) -> tuple[list, Counter]:
+    return _worker(rowid_range)
+
+
+class DataClassifier:
+    """
+    对作品数据文件中的作品进行分类
+
+    按 rowid 顺序将未分类的作品划分为区间，分类结果由单个写入线程批量提交；
+    已写入的分类结果不会重复处理，中断后再次运行即可继续处理剩余作品
+    """
+
+    BATCH = 1000
+    REPORT_INTERVAL = 2
+
+    def __init__(
+        self,
+        file: Path,
+        taxonomy: Taxonomy = None,
+        feature_cache: Path = None,
+        table: str = DataRecorder.TABLE,
+    ):
+        """
+        :param file: 作品数据文件 ExploreData.db
+        :param taxonomy: 分类体系，默认使用内置的分类体系
+        :param feature_cache: jieba 关键词提取结果缓存文件，为空时不缓存
+        """
+        self.file = file
+        self.taxonomy = taxonomy or Taxonomy.load()
+        self.feature_cache = feature_cache
+        self.table = table
+        # 最近一次分类的各阶段累计耗时，多进程分类时为全部进程的耗时之和
+        self.timings = Counter()
+
+    def run(
+        self,
+        workers: int = 1,
+        batch_size: int = BATCH,
+        dry_run: bool = False,
+        reclassify: bool = False,
+        log=None,
+    ) -> Counter:
+        """
+        :param workers: 分类进程数量，大于 1 时使用多进程分类
+        :param batch_size: 每个 rowid 区间包含的作品数量
+        :param dry_run: 仅统计分类结果，不修改作品数据文件
+        :param reclassify: 清空已有的分类结果，重新分类全部作品
+        :return: 本次分类的 (类别1, 类别2) 作品数量
+        """
+        counter = Counter()
+        self.timings = Counter()
+        if not (condition := self.__prepare(dry_run, reclassify)):
+            logging(log, _("作品数据文件中没有作品数据"), ERROR)
+            return counter
+        ranges, total = self.__ranges(condition, batch_size)
+        if not total:
+            logging(log, _("没有需要分类的作品"))
+            return counter
+        logging(log, _("开始分类 {0} 个作品").format(total), MASTER)
+        start = reported = perf_counter()
+        writer = nullcontext() if dry_run else CategoryWriter(self.file, self.table)
+        with writer:
+            for updates, timings in self.__classify(ranges, condition, workers):
+                if not dry_run:
+                    writer.put(updates)
+                counter.update((i[3], i[4]) for i in updates)
+                self.timings.update(timings)
+                if (now := perf_counter()) - reported >= self.REPORT_INTERVAL:
+                    reported = now
+                    self.__report(counter.total(), total, now - start, log)
+        if not dry_run:
+            self.timings["write"] = writer.elapsed
+        self.__report(counter.total(), total, perf_counter() - start, log)
+        logging(
+            log,
+            _("各阶段耗时：{0}").format(
+                ", ".join(f"{i} {j:.2f}s" for i, j in self.timings.items())
+            ),
+        )
+        if dry_run:
+            logging(log, _("预览模式，分类结果未写入作品数据文件"), WARNING)
+        for (cat1, cat2), count in counter.most_common():
+            logging(log, f"{cat1} / {cat2}: {count}", GENERAL)
+        return counter
+
+    def __prepare(self, dry_run: bool, reclassify: bool) -> str:
+        """检查分类字段与索引，返回待分类作品的查询条件"""
+        with closing(connect(self.file, timeout=30)) as database:
+            columns = {
+                i[1] for i in database.execute(f"PRAGMA table_info({self.table});")
+            }
+            if not columns:
+                return ""
+            if dry_run:
+                return "1" if reclassify or "类别1" not in columns else UNCLASSIFIED
+            with database:
+                for name, type_ in DataRecorder.CATEGORY_TABLE:
+                    if name not in columns:
+                        database.execute(
+                            f"ALTER TABLE {self.table} ADD COLUMN {name} {type_};"
+                        )
+                # 部分索引仅包含未分类的作品，作品完成分类后自动移出索引
+                database.execute(
+                    f"CREATE INDEX IF NOT EXISTS {self.table}_unclassified "
+                    f"ON {self.table} ({UNCLASSIFIED_KEY}) WHERE {UNCLASSIFIED};"
+                )
+                if reclassify:
+                    database.execute(
+                        f"UPDATE {self.table} SET 类别1_ID=NULL, 类别2_ID=NULL, "
+                        f"类别1=NULL, 类别2=NULL WHERE NOT ({UNCLASSIFIED});"
+                    )
+        return UNCLASSIFIED
+
+    def __ranges(
+        self,
+        condition: str,
+        batch_size: int,
+    ) -> tuple[list[tuple[int, int]], int]:
+        """单次遍历索引，按 rowid 顺序将待分类作品划分为区间"""
+        ranges = []
+        total = 0
+        with closing(connect(self.file, timeout=30)) as database:
+            cursor = database.execute(
+                f"SELECT rowid FROM {self.table} WHERE {condition} ORDER BY rowid;"
+            )
+            while rows := cursor.fetchmany(batch_size):
+                ranges.append((rows[0][0], rows[-1][0]))
+                total += len(rows)
+        return ranges, total
+
+    def __classify(
+        self,
+        ranges: list[tuple[int, int]],
+        condition: str,
+        workers: int,
+    ) -> Iterator[tuple[list, Counter]]:
+        args = (
+            self.file,
+            self.table,
+            condition,
+            self.taxonomy,
+            self.feature_cache,
+        )
+        if workers <= 1:
+            worker = RangeClassifier(*args)
+            try:
+                yield from map(worker, ranges)
+            finally:
+                worker.close()
+            return
+        # 分词与分类为 CPU 密集型任务，每个进程加载独立的 jieba 与关键词索引
+        with get_context("spawn").Pool(
+            workers,
+            initializer=_init_worker,
+            initargs=args,
+        ) as pool:
+            yield from pool.imap_unordered(_classify_range, ranges)
+
+    @staticmethod
+    def __report(count: int, total: int, elapsed: float, log) -> None:
+        logging(
+            log,
+            _("已分类 {0}/{1} 个作品，耗时 {2:.1f} 秒，速度 {3:.1f} 个/秒").format(
+                count,
+                total,
+                elapsed,
+                count / elapsed if elapsed else 0,
+            ),
+        )
@@ -0,0 +1,105 @@
+from contextlib import suppress
+from hashlib import sha256
+from json import dumps, loads
+from pathlib import Path
+
+from .matcher import KeywordMatcher
+
+__all__ = ["Taxonomy"]
+
+
+class Taxonomy:
+    """
+    作品分类体系
+
+    分类体系文件为 JSON 格式，结构与 taxonomy.json 相同；
+    关键词索引与匹配自动机编译后可缓存至磁盘，分类体系文件未修改时直接读取编译结果
+    """
+
+    DEFAULT = Path(__file__).with_name("taxonomy.json")
+    INDEX = "TaxonomyIndex.json"
+    # 编译结果的格式变化时需要修改版本
+    VERSION = 2
+
+    def __init__(
+        self,
+        categories: dict[int, dict],
+        default: tuple[int, int, str, str],
+        keyword_index: dict[str, list[tuple[int, int]]] = None,
+        matcher: KeywordMatcher = None,
+    ):
+        self.categories = categories
+        self.default = default
+        self.keyword_index = keyword_index or self.__build_index(categories)
+        self.matcher = matcher or KeywordMatcher(self.keyword_index)
+
+    @classmethod
+    def load(cls, file: Path = None, cache: Path = None) -> "Taxonomy":
+        """
+        读取分类体系文件
+
+        :param file: 分类体系文件路径，默认使用内置的分类体系
+        :param cache: 编译结果缓存文件夹，为空时不缓存
+        """
+        content = Path(file or cls.DEFAULT).read_bytes()
+        data = loads(content)
+        categories = {
+            int(i): {
+                "name": j["name"],
+                "subcategories": {int(k): v for k, v in j["subcategories"].items()},
+            }
+            for i, j in data["categories"].items()
+        }
+        default = tuple(data["default"])
+        if not cache:
+            return cls(categories, default)
+        digest = sha256(content).hexdigest()
+        index = cache.joinpath(cls.INDEX)
+        # 编译结果使用 JSON 格式保存，读取时不会执行缓存文件中的内容
+        with suppress(OSError, ValueError, KeyError, TypeError):
+            data = loads(index.read_bytes())
+            if data["version"] == cls.VERSION and data["digest"] == digest:
+                return cls(
+                    categories,
+                    default,
+                    {
+                        k: [tuple(i) for i in v]
+                        for k, v in data["keyword_index"].items()
+                    },
+                    KeywordMatcher.load(data["matcher"]),
+                )
+        taxonomy = cls(categories, default)
+        with suppress(OSError):
+            index.write_text(
+                dumps(
+                    {
+                        "version": cls.VERSION,
+                        "digest": digest,
+                        "keyword_index": taxonomy.keyword_index,
+                        "matcher": taxonomy.matcher.dump(),
+                    },
+                    ensure_ascii=False,
+                ),
+                encoding="utf-8",
+            )
+        return taxonomy
+
+    @staticmethod
+    def __build_index(categories: dict[int, dict]) -> dict[str, list[tuple[int, int]]]:
+        """构建关键词到分类的索引"""
+        keyword_index = {}
+        for cat1_id, cat1_info in categories.items():
+            for cat2_id, cat2_info in cat1_info["subcategories"].items():
+                for keyword in cat2_info["keywords"]:
+                    keyword_index.setdefault(keyword, []).append((cat1_id, cat2_id))
+        return keyword_index
+
+    def result(self, cat1_id: int, cat2_id: int) -> tuple[int, int, str, str]:
+        """返回 (类别1_ID, 类别2_ID, 类别1, 类别2)"""
+        category = self.categories[cat1_id]
+        return (
+            cat1_id,
+            cat2_id,
+            category["name"],
+            category["subcategories"][cat2_id]["name"],
+        )
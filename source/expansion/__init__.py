@@ -2,6 +2,7 @@ from .browser import BrowserCookie
 from .cleaner import Cleaner
 from .converter import Converter
 from .error import CacheError
+from .error import RecordUnavailable
 from .file_folder import file_switch
 from .file_folder import remove_empty_directories
 from .namespace import Namespace
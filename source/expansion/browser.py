@@ -1,19 +1,8 @@
 from contextlib import suppress
+from importlib import import_module
 from sys import platform
 
 from rich.console import Console
-from rookiepy import (
-    arc,
-    brave,
-    chrome,
-    chromium,
-    edge,
-    firefox,
-    librewolf,
-    opera,
-    opera_gx,
-    vivaldi,
-)
 
 try:
     from source.translation import _
@@ -24,17 +13,18 @@ __all__ = ["BrowserCookie"]
 
 
 class BrowserCookie:
+    # 值为 rookiepy 函数名称，读取 Cookie 时才导入 rookiepy
     SUPPORT_BROWSER = {
-        "Arc": (arc, "Linux, macOS, Windows"),
-        "Chrome": (chrome, "Linux, macOS, Windows"),
-        "Chromium": (chromium, "Linux, macOS, Windows"),
-        "Opera": (opera, "Linux, macOS, Windows"),
-        "OperaGX": (opera_gx, "macOS, Windows"),
-        "Brave": (brave, "Linux, macOS, Windows"),
-        "Edge": (edge, "Linux, macOS, Windows"),
-        "Vivaldi": (vivaldi, "Linux, macOS, Windows"),
-        "Firefox": (firefox, "Linux, macOS, Windows"),
-        "LibreWolf": (librewolf, "Linux, macOS, Windows"),
+        "Arc": ("arc", "Linux, macOS, Windows"),
+        "Chrome": ("chrome", "Linux, macOS, Windows"),
+        "Chromium": ("chromium", "Linux, macOS, Windows"),
+        "Opera": ("opera", "Linux, macOS, Windows"),
+        "OperaGX": ("opera_gx", "macOS, Windows"),
+        "Brave": ("brave", "Linux, macOS, Windows"),
+        "Edge": ("edge", "Linux, macOS, Windows"),
+        "Vivaldi": ("vivaldi", "Linux, macOS, Windows"),
+        "Firefox": ("firefox", "Linux, macOS, Windows"),
+        "LibreWolf": ("librewolf", "Linux, macOS, Windows"),
     }
 
     @classmethod
@@ -74,7 +64,7 @@ class BrowserCookie:
             console.print(_("浏览器名称或序号输入错误！"))
             return ""
         try:
-            cookies = browser(domains=domains)
+            cookies = getattr(import_module("rookiepy"), browser)(domains=domains)
             return "; ".join(f"{i['name']}={i['value']}" for i in cookies)
         except RuntimeError:
             console.print(_("获取 Cookie 失败，未找到 Cookie 数据！"))
@@ -105,10 +95,8 @@ class BrowserCookie:
 
 match platform:
     case "darwin":
-        from rookiepy import safari
-
         BrowserCookie.SUPPORT_BROWSER |= {
-            "Safari": (safari, "macOS"),
+            "Safari": ("safari", "macOS"),
         }
     case "linux":
         BrowserCookie.SUPPORT_BROWSER.pop("OperaGX")
@@ -1,10 +1,9 @@
+from functools import lru_cache
 from platform import system
-from re import compile
+from re import compile, escape
 from string import whitespace
 from warnings import warn
 
-from emoji import replace_emoji
-
 try:
     from source.translation import _
 except ImportError:
@@ -13,6 +12,8 @@ except ImportError:
 
 class Cleaner:
     CONTROL_CHARACTERS = compile(r"[\x00-\x1F\x7F]")
+    CACHE = 4096
+    EMOJI = None
 
     def __init__(self):
         """
@@ -20,6 +21,61 @@ class Cleaner:
         """
         self.rule = self.default_rule()  # 默认非法字符字典
 
+    @property
+    def rule(self) -> dict[str, str]:
+        return self.__rule
+
+    @rule.setter
+    def rule(self, rule: dict[str, str]):
+        """更新非法字符字典时重新生成替换规则，并清空文件名称缓存"""
+        self.__rule = rule
+        # 删除字符使用单个字符集正则，CJK 文本上比逐个 replace 与 str.translate 更快
+        delete = [k for k, v in rule.items() if len(k) == 1 and not v]
+        self.__delete = self.__character_class(delete)
+        self.__name_delete = self.__character_class(
+            delete + [chr(i) for i in (*range(0x20), 0x7F)]
+        )
+        self.__table = str.maketrans(
+            {k: v for k, v in rule.items() if len(k) == 1 and v}
+        )
+        self.__multiple = {k: v for k, v in rule.items() if len(k) > 1}
+        self.__filter_name = lru_cache(maxsize=self.CACHE)(self.__filter_name_uncached)
+
+    @staticmethod
+    def __character_class(characters: list[str]):
+        if not characters:
+            return None
+        return compile(f"[{''.join(escape(i) for i in sorted(set(characters)))}]")
+
+    @classmethod
+    def __emoji_pattern(cls):
+        """匹配可能组成 emoji 的连续字符，仅对匹配结果调用 replace_emoji"""
+        if cls.EMOJI is None:
+            from emoji import EMOJI_DATA
+
+            codes = sorted({ord(i) for i in "".join(EMOJI_DATA)} | {0x200D, 0xFE0F})
+            ranges = []
+            for code in codes:
+                if ranges and code == ranges[-1][1] + 1:
+                    ranges[-1][1] = code
+                else:
+                    ranges.append([code, code])
+            cls.EMOJI = compile(f"[{''.join(cls.__range(*i) for i in ranges)}]+")
+        return cls.EMOJI
+
+    @staticmethod
+    def __range(start: int, end: int) -> str:
+        if start == end:
+            return escape(chr(start))
+        return f"{escape(chr(start))}-{escape(chr(end))}"
+
+    @staticmethod
+    def __replace_emoji(text: str, replace: str) -> str:
+        from emoji import replace_emoji
+
+        # 单独的数字、# 与 * 不是 emoji
+        return text if text.isascii() else replace_emoji(text, replace)
+
     @staticmethod
     def default_rule():
         """根据系统类型生成默认非法字符字典"""
@@ -63,8 +119,15 @@ class Cleaner:
         :param text: 待处理的字符串
         :return: 替换后的字符串，如果替换后字符串为空，则返回 None
         """
-        for i in self.rule:
-            text = text.replace(i, self.rule[i])
+        return self.__replace(text, self.__delete)
+
+    def __replace(self, text: str, delete) -> str:
+        if delete:
+            text = delete.sub("", text)
+        if self.__table:
+            text = text.translate(self.__table)
+        for i, j in self.__multiple.items():
+            text = text.replace(i, j)
         return text
 
     def filter_name(
@@ -73,17 +136,23 @@ class Cleaner:
         replace: str = "",
         default: str = "",
     ) -> str:
-        """过滤文件夹名称中的非法字符"""
-        text = text.replace(":", ".")
-
-        text = self.remove_control_characters(text)
+        """过滤文件夹名称中的非法字符，重复的名称直接返回缓存结果"""
+        return self.__filter_name(text, replace, default)
 
-        text = self.filter(text)
-
-        text = replace_emoji(
-            text,
-            replace,
-        )
+    def __filter_name_uncached(
+        self,
+        text: str,
+        replace: str,
+        default: str,
+    ) -> str:
+        text = self.__replace(text.replace(":", "."), self.__name_delete)
+
+        # emoji 均包含非 ASCII 字符
+        if not text.isascii():
+            text = self.__emoji_pattern().sub(
+                lambda m: self.__replace_emoji(m.group(), replace),
+                text,
+            )
 
         text = self.clear_spaces(text)
 
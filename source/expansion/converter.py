@@ -1,8 +1,5 @@
 from typing import Union
 
-from lxml.etree import HTML
-from yaml import safe_load
-
 __all__ = ["Converter"]
 
 
@@ -21,12 +18,16 @@ class Converter:
     def _extract_object(self, html: str) -> str:
         if not html:
             return ""
+        from lxml.etree import HTML
+
         html_tree = HTML(html)
         scripts = html_tree.xpath(self.INITIAL_STATE)
         return self.get_script(scripts)
 
     @staticmethod
     def _convert_object(text: str) -> dict:
+        from yaml import safe_load
+
         return safe_load(text.lstrip("window.__INITIAL_STATE__="))
 
     @classmethod
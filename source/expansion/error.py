@@ -5,3 +5,14 @@ class CacheError(Exception):
 
     def __str__(self):
         return self.message
+
+
+class RecordUnavailable(Exception):
+    """下载记录服务器请求失败"""
+
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.message = message
+
+    def __str__(self):
+        return self.message
@@ -1,19 +1,42 @@
-from unicodedata import name
+from bisect import bisect_right
+from re import compile
+
+# 名称包含 “CJK” 的字符所在码位区间，已分配码位的判断结果与 unicodedata.name 一致
+CJK_RANGES = (
+    (0x2E80, 0x2EFF),
+    (0x31C0, 0x31EF),
+    (0x3400, 0x4DBF),
+    (0x4E00, 0x9FFF),
+    (0xF900, 0xFAFF),
+    (0x1F210, 0x1F212),
+    (0x1F214, 0x1F23B),
+    (0x1F240, 0x1F248),
+    (0x20000, 0x323AF),
+)
+CJK_STARTS = tuple(i[0] for i in CJK_RANGES)
+CJK = compile(f"[{''.join(f'{chr(i)}-{chr(j)}' for i, j in CJK_RANGES)}]")
 
 
 def is_chinese_char(char: str) -> bool:
-    return "CJK" in name(char, "")
+    if (code := ord(char)) < 0x2E80:
+        return False
+    index = bisect_right(CJK_STARTS, code) - 1
+    return code <= CJK_RANGES[index][1]
+
+
+def string_width(s: str) -> int:
+    if s.isascii():
+        return len(s)
+    return len(s) + len(CJK.findall(s))
 
 
 def truncate_string(s: str, length: int = 64) -> str:
     count = 0
-    result = ""
-    for char in s:
+    for index, char in enumerate(s):
         count += 2 if is_chinese_char(char) else 1
         if count > length:
-            break
-        result += char
-    return result
+            return s[:index]
+    return s
 
 
 def trim_string(s: str, length: int = 64) -> str:
@@ -22,12 +45,7 @@ def trim_string(s: str, length: int = 64) -> str:
 
 
 def beautify_string(s: str, length: int = 64) -> str:
-    count = 0
-    for char in s:
-        count += 2 if is_chinese_char(char) else 1
-        if count > length:
-            break
-    else:
+    if len(s) * 2 <= length or string_width(s) <= length:
         return s
     length //= 2
     start = truncate_string(s, length)
@@ -1,14 +1,15 @@
+from .cache import NoteCache
 from .extend import Account
 from .manager import Manager
-from .model import (
-    ExtractData,
-    ExtractParams,
-)
 from .recorder import DataRecorder
 from .recorder import IDRecorder
 from .recorder import MapRecorder
+from .recorder import RemoteRecorder
 from .mapping import Mapping
+from .metrics import METRICS, Counter, Gauge
 from .settings import Settings
+from .tasks import JobRecorder
+from .tasks import TaskQueue
 from .static import (
     VERSION_MAJOR,
     VERSION_MINOR,
@@ -39,3 +40,24 @@ from .tools import (
     sleep_time,
     retry_limited,
 )
+
+
+# Web API 数据模型依赖 pydantic，仅在使用时导入
+_MODELS = {
+    "BatchData",
+    "ClaimParams",
+    "ExtractData",
+    "ExtractParams",
+    "JobData",
+    "JobParams",
+    "RecordParams",
+    "RequestContext",
+}
+
+
+def __getattr__(name: str):
+    if name in _MODELS:
+        from . import model
+
+        return getattr(model, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,169 @@
+from asyncio import CancelledError, Future, current_task, get_running_loop, shield
+from collections import OrderedDict
+from contextlib import suppress
+from copy import deepcopy
+from json import dumps, loads
+from pathlib import Path
+from time import time
+from typing import Awaitable, Callable
+
+from aiosqlite import connect
+
+__all__ = ["NoteCache"]
+
+
+class NoteCache:
+    """
+    作品数据缓存，按作品 ID 缓存解析后的作品数据与下载地址
+
+    同时满足有效期与容量限制，超出容量时淘汰最久未使用的数据；
+    同一作品的并发请求只会触发一次数据获取
+    """
+
+    def __init__(
+        self,
+        capacity: int = 1024,
+        ttl: int = 300,
+        file: Path = None,
+    ):
+        self.capacity = capacity
+        self.ttl = ttl
+        self.file = file
+        self.switch = False
+        self.cache: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self.pending: dict[str, Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.database = None
+
+    async def _connect_database(self):
+        self.database = await connect(self.file, timeout=30)
+        await self.database.execute("PRAGMA journal_mode=WAL;")
+        await self.database.execute(
+            "CREATE TABLE IF NOT EXISTS note_cache ("
+            "ID TEXT PRIMARY KEY,"
+            "DATA TEXT NOT NULL,"
+            "EXPIRE REAL NOT NULL"
+            ");"
+        )
+        await self.database.execute(
+            "DELETE FROM note_cache WHERE EXPIRE<?;",
+            (time(),),
+        )
+        await self.database.commit()
+
+    async def get(
+        self,
+        id_: str,
+        factory: Callable[[], Awaitable[dict]],
+    ) -> dict:
+        """
+        读取作品数据，缓存不存在或已过期时调用 factory 获取数据
+
+        :param id_: 作品 ID
+        :param factory: 获取作品数据的协程函数，返回空数据时不会写入缓存
+        :return: 作品数据副本，调用方可以直接修改
+        """
+        if not self.switch or self.ttl <= 0:
+            return await factory()
+        if (data := await self.__select(id_)) is not None:
+            self.hits += 1
+            return deepcopy(data)
+        if future := self.pending.get(id_):
+            self.coalesced += 1
+            try:
+                # 等待的协程被取消时不会取消共享的 Future，避免影响发起请求的协程
+                return deepcopy(await shield(future))
+            except CancelledError:
+                if not future.cancelled() or current_task().cancelling():
+                    raise
+                # 发起请求的协程被取消，由当前协程重新获取数据
+                return await self.get(id_, factory)
+        self.misses += 1
+        self.pending[id_] = future = get_running_loop().create_future()
+        try:
+            data = await factory()
+        except CancelledError:
+            future.cancel()
+            raise
+        except Exception as error:
+            if not future.done():
+                future.set_exception(error)
+                # 避免没有其他请求等待时产生未获取异常的警告
+                future.exception()
+            raise
+        else:
+            if not future.done():
+                future.set_result(data)
+        finally:
+            del self.pending[id_]
+        if data:
+            await self.__insert(id_, data)
+        return deepcopy(data)
+
+    async def __select(self, id_: str) -> dict | None:
+        if item := self.cache.get(id_):
+            if item[0] > time():
+                self.cache.move_to_end(id_)
+                return item[1]
+            del self.cache[id_]
+        if not self.database:
+            return None
+        async with self.database.execute(
+            "SELECT DATA, EXPIRE FROM note_cache WHERE ID=? AND EXPIRE>?;",
+            (
+                id_,
+                time(),
+            ),
+        ) as cursor:
+            if not (row := await cursor.fetchone()):
+                return None
+        data = loads(row[0])
+        self.__store(id_, data, row[1])
+        return data
+
+    async def __insert(self, id_: str, data: dict) -> None:
+        expire = time() + self.ttl
+        self.__store(id_, deepcopy(data), expire)
+        if self.database:
+            await self.database.execute(
+                "REPLACE INTO note_cache VALUES (?, ?, ?);",
+                (
+                    id_,
+                    dumps(data, ensure_ascii=False),
+                    expire,
+                ),
+            )
+            await self.database.commit()
+
+    def __store(self, id_: str, data: dict, expire: float) -> None:
+        self.cache[id_] = (expire, data)
+        self.cache.move_to_end(id_)
+        while len(self.cache) > self.capacity:
+            self.cache.popitem(last=False)
+
+    def statistics(self) -> dict:
+        total = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": (self.hits + self.coalesced) / total if total else 0.0,
+            "size": len(self.cache),
+            "capacity": self.capacity,
+            "ttl": self.ttl,
+        }
+
+    async def __aenter__(self):
+        self.switch = True
+        if self.file:
+            await self._connect_database()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.switch = False
+        if self.database:
+            with suppress(CancelledError):
+                await self.database.close()
+            self.database = None
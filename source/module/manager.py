@@ -1,3 +1,6 @@
+from asyncio import Task, create_task, gather
+from collections import OrderedDict
+from contextlib import contextmanager
 from pathlib import Path
 from re import compile, sub
 from shutil import move, rmtree
@@ -8,7 +11,6 @@ from httpx import (
     HTTPStatusError,
     RequestError,
     TimeoutException,
-    get,
 )
 
 from source.expansion import remove_empty_directories
@@ -21,6 +23,9 @@ __all__ = ["Manager"]
 
 
 class Manager:
+    # 客户端缓存的代理数量上限，超出时关闭最久未使用的代理客户端，程序配置的代理不会被关闭
+    # 被淘汰的客户端仍在使用时，等待最后一个使用者结束后再关闭
+    CLIENTS = 16
     NAME = compile(r"[^\u4e00-\u9fffa-zA-Z0-9-_！？，。；：“”（）《》]")
     NAME_KEYS = (
         "收藏数量",
@@ -86,34 +91,15 @@ class Manager:
         self.folder_mode = self.check_bool(folder_mode, False)
         self.download_record = self.check_bool(download_record, True)
         self.proxy_tip = None
-        self.proxy = self.__check_proxy(proxy)
-        self.print_proxy_tip(
-            _print,
-        )
+        self.proxy = proxy or None
+        self.print_tip = _print
         self.timeout = timeout
-        self.request_client = AsyncClient(
-            headers=self.headers
-            | {
-                "referer": "https://www.xiaohongshu.com/",
-            },
-            timeout=timeout,
-            verify=False,
-            follow_redirects=True,
-            mounts={
-                "http://": AsyncHTTPTransport(proxy=self.proxy),
-                "https://": AsyncHTTPTransport(proxy=self.proxy),
-            },
-        )
-        self.download_client = AsyncClient(
-            headers=self.blank_headers,
-            timeout=timeout,
-            verify=False,
-            follow_redirects=True,
-            mounts={
-                "http://": AsyncHTTPTransport(proxy=self.proxy),
-                "https://": AsyncHTTPTransport(proxy=self.proxy),
-            },
+        self.clients: OrderedDict[str | None, tuple[AsyncClient, AsyncClient]] = (
+            OrderedDict()
         )
+        self.closing: set[Task] = set()
+        self.users: dict[tuple[AsyncClient, AsyncClient], int] = {}
+        self.evicted: set[tuple[AsyncClient, AsyncClient]] = set()
         self.image_download = self.check_bool(image_download, True)
         self.video_download = self.check_bool(video_download, True)
         self.live_download = self.check_bool(live_download, True)
@@ -127,6 +113,103 @@ class Manager:
             return r
         return r if (r := self.__check_root_again(r)) else self.root
 
+    @property
+    def request_client(self) -> AsyncClient:
+        return self.client()
+
+    @property
+    def download_client(self) -> AsyncClient:
+        return self.downloader()
+
+    def client(self, proxy: str = None) -> AsyncClient:
+        """获取请求作品页面的客户端，同一代理的请求共用连接池；使用其他代理时应调用 borrow"""
+        return self.__clients(proxy or self.proxy)[0]
+
+    def downloader(self, proxy: str = None) -> AsyncClient:
+        """获取下载作品文件的客户端，同一代理的请求共用连接池；使用其他代理时应调用 borrow"""
+        return self.__clients(proxy or self.proxy)[1]
+
+    @contextmanager
+    def borrow(self, proxy: str = None, download: bool = False):
+        """
+        使用指定代理的客户端，使用期间客户端不会因缓存淘汰而关闭
+
+        :param proxy: 代理地址，为空时使用程序配置的代理
+        :param download: 是否获取下载作品文件的客户端
+        """
+        clients = self.__clients(proxy or self.proxy)
+        self.users[clients] = self.users.get(clients, 0) + 1
+        try:
+            yield clients[download]
+        finally:
+            if self.users[clients] > 1:
+                self.users[clients] -= 1
+            else:
+                del self.users[clients]
+                if clients in self.evicted:
+                    self.evicted.discard(clients)
+                    self.__schedule_close(clients)
+
+    def __clients(self, proxy: str | None) -> tuple[AsyncClient, AsyncClient]:
+        if clients := self.clients.get(proxy):
+            self.clients.move_to_end(proxy)
+            return clients
+        self.clients[proxy] = clients = (
+            AsyncClient(
+                headers=self.headers
+                | {
+                    "referer": "https://www.xiaohongshu.com/",
+                },
+                timeout=self.timeout,
+                verify=False,
+                follow_redirects=True,
+                mounts=self.__mounts(proxy),
+            ),
+            AsyncClient(
+                headers=self.blank_headers,
+                timeout=self.timeout,
+                verify=False,
+                follow_redirects=True,
+                mounts=self.__mounts(proxy),
+            ),
+        )
+        self.__evict()
+        return clients
+
+    def __evict(self) -> None:
+        while len(self.clients) > self.CLIENTS:
+            proxy = next(i for i in self.clients if i != self.proxy)
+            clients = self.clients.pop(proxy)
+            if clients in self.users:
+                self.evicted.add(clients)
+            else:
+                self.__schedule_close(clients)
+
+    def __schedule_close(self, clients: tuple[AsyncClient, AsyncClient]) -> None:
+        task = create_task(self.__close_clients(clients))
+        self.closing.add(task)
+        task.add_done_callback(self.closing.discard)
+
+    @staticmethod
+    async def __close_clients(clients: tuple[AsyncClient, AsyncClient]) -> None:
+        for client in clients:
+            await client.aclose()
+
+    @staticmethod
+    def __mounts(proxy: str | None) -> dict[str, AsyncHTTPTransport]:
+        return {
+            "http://": AsyncHTTPTransport(proxy=proxy),
+            "https://": AsyncHTTPTransport(proxy=proxy),
+        }
+
+    def select_folder(self, folder: str = None) -> Path:
+        """获取作品下载文件夹，自定义文件夹仅允许位于作品储存路径下"""
+        if not folder or not (name := self.filter_name(folder)):
+            return self.folder
+        folder = self.path.joinpath(name)
+        folder.mkdir(exist_ok=True)
+        return folder
+
     def __check_folder(self, folder: str) -> Path:
         folder = self.path.joinpath(folder or "Download")
         folder.mkdir(exist_ok=True)
@@ -194,8 +277,12 @@ class Manager:
         return value if isinstance(value, bool) else default
 
     async def close(self):
-        await self.request_client.aclose()
-        await self.download_client.aclose()
+        for clients in (*self.clients.values(), *self.evicted):
+            await self.__close_clients(clients)
+        self.clients.clear()
+        self.evicted.clear()
+        if self.closing:
+            await gather(*self.closing)
         # self.__clean()
         remove_empty_directories(self.root)
         remove_empty_directories(self.folder)
@@ -207,40 +294,42 @@ class Manager:
             format_,
         )
 
-    def __check_proxy(
+    async def check_proxy(
         self,
-        proxy: str,
         url="https://www.xiaohongshu.com/explore",
-    ) -> str | None:
-        if proxy:
-            try:
-                response = get(
-                    url,
-                    proxy=proxy,
-                    timeout=10,
-                    headers={
-                        "User-Agent": USERAGENT,
-                    },
-                )
-                response.raise_for_status()
-                self.proxy_tip = (_("代理 {0} 测试成功").format(proxy),)
-                return proxy
-            except TimeoutException:
-                self.proxy_tip = (
-                    _("代理 {0} 测试超时").format(proxy),
-                    WARNING,
-                )
-            except (
-                RequestError,
-                HTTPStatusError,
-            ) as e:
-                self.proxy_tip = (
-                    _("代理 {0} 测试失败：{1}").format(
-                        proxy,
-                        e,
-                    ),
-                    WARNING,
-                )
+    ) -> None:
+        """测试全局代理，测试失败时不使用代理"""
+        if not (proxy := self.proxy):
+            return
+        try:
+            response = await self.downloader(proxy).get(
+                url,
+                timeout=10,
+                headers={
+                    "User-Agent": USERAGENT,
+                },
+            )
+            response.raise_for_status()
+            self.proxy_tip = (_("代理 {0} 测试成功").format(proxy),)
+        except TimeoutException:
+            self.proxy = None
+            self.proxy_tip = (
+                _("代理 {0} 测试超时").format(proxy),
+                WARNING,
+            )
+        except (
+            RequestError,
+            HTTPStatusError,
+        ) as e:
+            self.proxy = None
+            self.proxy_tip = (
+                _("代理 {0} 测试失败：{1}").format(
+                    proxy,
+                    e,
+                ),
+                WARNING,
+            )
+        self.print_proxy_tip(self.print_tip)
 
     def print_proxy_tip(
         self,
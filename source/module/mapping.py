@@ -1,3 +1,5 @@
+from asyncio import Lock, to_thread
+from os import scandir
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -14,6 +16,13 @@ __all__ = ["Mapping"]
 
 
 class Mapping:
+    """
+    作者别名映射
+
+    作者别名变化时根据文件索引重命名作者文件夹、作品文件夹与作品文件，无需遍历作者文件夹；
+    重命名前记录别名变化，程序中断后再次运行时继续处理
+    """
+
     def __init__(
         self,
         manager: "Manager",
@@ -23,6 +32,7 @@ class Mapping:
         self.folder_mode = manager.folder_mode
         self.database = mapping
         self.switch = manager.author_archive
+        self.lock = Lock()
 
     async def update_cache(
         self,
@@ -32,167 +42,208 @@ class Mapping:
     ):
         if not self.switch:
             return
-        if (a := await self.has_mapping(id_)) and a != alias:
-            self.__check_file(
-                id_,
-                alias,
-                a,
-                log,
-            )
-        await self.database.add(id_, alias)
+        async with self.lock:
+            if not (a := await self.has_mapping(id_)):
+                await self.database.add(id_, alias)
+            elif a != alias:
+                await self.database.begin_rename(id_, a, alias)
+                await self.__remap(
+                    id_,
+                    alias,
+                    a,
+                    log,
+                )
 
     async def has_mapping(self, id_: str) -> str:
         return d[0] if (d := await self.database.select(id_)) else ""
 
-    def __check_file(
+    async def resume(self, log=None):
+        """继续处理上次运行中断的作者文件夹重命名"""
+        if not self.switch:
+            return
+        async with self.lock:
+            for id_, old_alias, alias in await self.database.journals():
+                await self.__remap(
+                    id_,
+                    alias,
+                    old_alias,
+                    log,
+                )
+
+    async def add_files(
+        self,
+        id_: str,
+        work: str,
+        root: Path,
+        files: list[Path],
+    ):
+        """
+        记录作品文件
+
+        :param root: 作品下载文件夹
+        :param files: 作者文件夹内的作品文件
+        """
+        if not self.switch or not files:
+            return
+        parts = [i.relative_to(root).parts for i in files]
+        async with self.lock:
+            await self.__index(id_, root, root.joinpath(parts[0][0]))
+            await self.database.add_files(
+                id_,
+                str(root),
+                ("/".join(i[1:]) for i in parts),
+                work,
+            )
+
+    async def __index(self, id_: str, root: Path, folder: Path) -> list[str]:
+        """首次处理作者文件夹时记录已有的文件，此后不再遍历作者文件夹"""
+        if await self.database.indexed(id_, str(root)):
+            return []
+        paths = await to_thread(self.__scan, folder)
+        await self.database.add_files(id_, str(root), paths)
+        return paths
+
+    @staticmethod
+    def __scan(folder: Path) -> list[str]:
+        paths = []
+        if not folder.is_dir():
+            return paths
+        # DirEntry 的类型判断通常无需额外读取文件信息
+        with scandir(folder) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    with scandir(entry.path) as files:
+                        paths.extend(
+                            f"{entry.name}/{i.name}" for i in files if i.is_file()
+                        )
+                elif entry.is_file():
+                    paths.append(entry.name)
+        return paths
+
+    async def __remap(
         self,
         id_: str,
         alias: str,
         old_alias: str,
         log,
     ):
-        if not (old_folder := self.root.joinpath(f"{id_}_{old_alias}")).is_dir():
+        """按照文件索引重命名全部下载文件夹中的作者文件，完成后以单个事务更新文件索引"""
+        index = await self.database.files(id_)
+        changes = []
+        for root in {self.root, *map(Path, index)}:
+            old_folder = root.joinpath(f"{id_}_{old_alias}")
+            new_folder = root.joinpath(f"{id_}_{alias}")
+            if not (old_folder.is_dir() or new_folder.is_dir()):
+                logging(
+                    log,
+                    _("{old_folder} 文件夹不存在，跳过处理").format(
+                        old_folder=old_folder.name
+                    ),
+                )
+                continue
+            if (key := str(root)) not in index:
+                index[key] = await self.__index(id_, root, old_folder)
+            if not self.__rename_folder(
+                old_folder,
+                new_folder,
+                log,
+            ):
+                continue
+            changes.extend(
+                (key, *i)
+                for i in self.__rename_files(
+                    new_folder,
+                    index[key],
+                    alias,
+                    old_alias,
+                    log,
+                )
+            )
+        await self.database.finish_rename(id_, changes)
+        if changes:
             logging(
                 log,
-                _("{old_folder} 文件夹不存在，跳过处理").format(
-                    old_folder=old_folder.name
-                ),
+                _("作者 {0} 共有 {1} 个作品文件完成重命名").format(id_, len(changes)),
             )
-            return
-        self.__rename_folder(
-            old_folder,
-            id_,
-            alias,
-            log,
-        )
-        self.__scan_file(
-            id_,
-            alias,
-            old_alias,
-            log,
-        )
 
     def __rename_folder(
         self,
         old_folder: Path,
-        id_: str,
-        alias: str,
+        new_folder: Path,
         log,
-    ):
-        new_folder = self.root.joinpath(f"{id_}_{alias}")
-        self.__rename(
+    ) -> bool:
+        if not self.__rename(
             old_folder,
             new_folder,
             _("文件夹"),
             log,
-        )
+        ):
+            return False
         logging(
             log,
             _("文件夹 {old_folder} 已重命名为 {new_folder}").format(
                 old_folder=old_folder.name, new_folder=new_folder.name
             ),
         )
+        return True
 
-    def __rename_works_folder(
-        self,
-        old_: Path,
-        alias: str,
-        old_alias: str,
-        log,
-    ) -> Path:
-        if old_alias in old_.name:
-            new_ = old_.parent / old_.name.replace(old_alias, alias, 1)
-            self.__rename(
-                old_,
-                new_,
-                _("文件夹"),
-                log,
-            )
-            logging(
-                log,
-                _("文件夹 {old_} 重命名为 {new_}").format(
-                    old_=old_.name, new_=new_.name
-                ),
-            )
-            return new_
-        return old_
-
-    def __scan_file(
+    def __rename_files(
         self,
-        id_: str,
+        folder: Path,
+        paths: list[str],
         alias: str,
         old_alias: str,
         log,
-    ):
-        root = self.root.joinpath(f"{id_}_{alias}")
-        item_list = root.iterdir()
-        if self.folder_mode:
-            for f in item_list:
-                if f.is_dir():
-                    f = self.__rename_works_folder(
-                        f,
-                        alias,
-                        old_alias,
-                        log,
-                    )
-                    files = f.iterdir()
-                    self.__batch_rename(
-                        f,
-                        files,
-                        alias,
-                        old_alias,
-                        log,
-                    )
-        else:
-            self.__batch_rename(
-                root,
-                item_list,
+    ) -> list[tuple[str, str]]:
+        """重命名作者文件夹内的作品文件夹与作品文件，返回 (原相对路径, 新相对路径)"""
+        changes = []
+        works = {}
+        for path in paths:
+            work, __, name = path.rpartition("/")
+            if work not in works:
+                works[work] = self.__rename_item(
+                    folder,
+                    work,
+                    alias,
+                    old_alias,
+                    _("文件夹"),
+                    log,
+                )
+            name = self.__rename_item(
+                folder.joinpath(works[work]),
+                name,
                 alias,
                 old_alias,
+                _("文件"),
                 log,
             )
+            if (new := f"{works[work]}/{name}" if work else name) != path:
+                changes.append((path, new))
+        return changes
 
-    def __batch_rename(
+    def __rename_item(
         self,
-        root: Path,
-        files,
+        folder: Path,
+        name: str,
         alias: str,
         old_alias: str,
+        type_: str,
         log,
-    ):
-        for old_file in files:
-            if old_alias not in old_file.name:
-                break
-            self.__rename_file(
-                root,
-                old_file,
-                alias,
-                old_alias,
+    ) -> str:
+        """名称包含原别名时重命名，返回重命名后的名称"""
+        if not name or old_alias not in name:
+            return name
+        new = name.replace(old_alias, alias, 1)
+        return (
+            new
+            if self.__rename(
+                folder.joinpath(name),
+                folder.joinpath(new),
+                type_,
                 log,
             )
-
-    def __rename_file(
-        self,
-        root: Path,
-        old_file: Path,
-        alias: str,
-        old_alias: str,
-        log,
-    ):
-        new_file = root.joinpath(old_file.name.replace(old_alias, alias, 1))
-        self.__rename(
-            old_file,
-            new_file,
-            _("文件"),
-            log,
-        )
-        logging(
-            log,
-            _("文件 {old_file} 重命名为 {new_file}").format(
-                old_file=old_file.name, new_file=new_file.name
-            ),
+            else name
         )
-        return True
 
     @staticmethod
     def __rename(
@@ -204,6 +255,9 @@ class Mapping:
         try:
             old_.rename(new_)
             return True
+        except FileNotFoundError:
+            # 继续处理中断的重命名时，文件可能已经完成重命名
+            return new_.exists()
         except PermissionError as e:
             logging(
                 log,
@@ -230,4 +284,4 @@ class Mapping:
                 ),
                 ERROR,
             )
-            return True
+            return False
@@ -0,0 +1,183 @@
+from bisect import bisect_left
+from contextlib import contextmanager
+from os import getpid
+from time import perf_counter
+from typing import Callable
+
+__all__ = ["Counter", "Gauge", "Histogram", "Metrics", "METRICS"]
+
+
+def _labels(labels: tuple[tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}"
+
+
+class Counter:
+    TYPE = "counter"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        function: Callable[[], float] = None,
+    ):
+        """
+        :param function: 读取指标值的函数，用于导出其他对象已有的计数
+        """
+        self.name = name
+        self.documentation = documentation
+        self.function = function
+        self.values: dict[tuple, float] = {}
+
+    def inc(self, value: float = 1, **labels) -> None:
+        key = tuple(labels.items())
+        self.values[key] = self.values.get(key, 0) + value
+
+    def samples(self):
+        if self.function:
+            yield self.name, (), self.function()
+            return
+        if not self.values:
+            yield self.name, (), 0
+        for key, value in self.values.items():
+            yield self.name, key, value
+
+
+class Gauge(Counter):
+    TYPE = "gauge"
+
+    def dec(self, value: float = 1, **labels) -> None:
+        self.inc(-value, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        self.values[tuple(labels.items())] = value
+
+
+class Histogram:
+    TYPE = "histogram"
+    BUCKETS = (
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1.0,
+        2.5,
+        5.0,
+        10.0,
+        30.0,
+        60.0,
+        float("inf"),
+    )
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        buckets: tuple[float, ...] = BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    @contextmanager
+    def time(self):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(perf_counter() - start)
+
+    def samples(self):
+        total = 0
+        for bucket, count in zip(self.buckets, self.counts):
+            total += count
+            le = "+Inf" if bucket == float("inf") else repr(bucket)
+            yield f"{self.name}_bucket", (("le", le),), total
+        yield f"{self.name}_sum", (), self.sum
+        yield f"{self.name}_count", (), self.count
+
+
+class Metrics:
+    """进程内运行指标，使用 Prometheus 文本格式导出"""
+
+    def __init__(self):
+        self.page = Histogram(
+            "xhs_page_fetch_seconds",
+            "Time spent fetching note pages",
+        )
+        self.parse = Histogram(
+            "xhs_parse_seconds",
+            "Time spent parsing the initial state of note pages",
+        )
+        self.extract = Histogram(
+            "xhs_extract_seconds",
+            "Time spent extracting note data",
+        )
+        self.download = Histogram(
+            "xhs_download_seconds",
+            "Time spent downloading a single file",
+        )
+        self.notes = Counter(
+            "xhs_notes_total",
+            "Processed notes by result",
+        )
+        self.retries = Counter(
+            "xhs_retries_total",
+            "Retried requests by function",
+        )
+        self.skips = Counter(
+            "xhs_skips_total",
+            "Notes skipped because of an existing download record",
+        )
+        self.bytes = Counter(
+            "xhs_download_bytes_total",
+            "Bytes downloaded",
+        )
+        self.active = Gauge(
+            "xhs_download_active",
+            "Occupied download semaphore slots",
+        )
+        self.collectors: list[Counter | Gauge | Histogram] = [
+            self.page,
+            self.parse,
+            self.extract,
+            self.download,
+            self.notes,
+            self.retries,
+            self.skips,
+            self.bytes,
+            self.active,
+        ]
+
+    def register(self, collector: Counter | Gauge | Histogram) -> None:
+        self.collectors = [i for i in self.collectors if i.name != collector.name] + [
+            collector
+        ]
+
+    def render(self) -> str:
+        """导出全部指标，每个样本均携带当前进程 ID 作为 worker 标签"""
+        worker = (("worker", str(getpid())),)
+        lines = []
+        for collector in self.collectors:
+            lines.append(f"# HELP {collector.name} {collector.documentation}")
+            lines.append(f"# TYPE {collector.name} {collector.TYPE}")
+            lines.extend(
+                f"{name}{_labels(labels + worker)} {value}"
+                for name, labels, value in collector.samples()
+            )
+        return "\n".join(lines) + "\n"
+
+
+METRICS = Metrics()
@@ -1,16 +1,80 @@
-from pydantic import BaseModel
+from hashlib import sha1
+
+from pydantic import BaseModel, ConfigDict
 
 
 class ExtractParams(BaseModel):
     url: str
     download: bool = False
-    index: list = None
-    cookie: str = None
-    proxy: str = None
+    index: list | None = None
+    cookie: str | None = None
+    proxy: str | None = None
+    folder: str | None = None
     skip: bool = False
 
+    def context(self) -> "RequestContext":
+        return RequestContext(
+            cookie=self.cookie,
+            proxy=self.proxy,
+            folder=self.folder,
+        )
+
+
+class RequestContext(BaseModel):
+    """单次请求的独立参数，未设置的参数使用全局配置"""
+
+    model_config = ConfigDict(frozen=True)
+
+    cookie: str | None = None
+    proxy: str | None = None
+    folder: str | None = None
+
+    def cache_key(self, id_: str) -> str:
+        """使用自定义 Cookie 获取的作品数据不与其他请求共享缓存"""
+        if not self.cookie:
+            return id_
+        return f"{id_}_{sha1(self.cookie.encode()).hexdigest()[:16]}"
+
 
 class ExtractData(BaseModel):
     message: str
     params: ExtractParams
     data: dict | None
+
+
+class BatchData(BaseModel):
+    message: str
+    url: str
+    data: dict | None
+
+
+class JobParams(BaseModel):
+    """任务查询结果中的任务参数，不返回提交者的 Cookie 与代理"""
+
+    url: str
+    download: bool = False
+    index: list | None = None
+    folder: str | None = None
+    skip: bool = False
+
+
+class JobData(BaseModel):
+    id: str
+    status: str
+    total: int
+    finished: int
+    created: int
+    updated: int
+    params: JobParams
+
+
+class RecordParams(BaseModel):
+    ids: list[str] = []
+    author: str | None = None
+    pattern: str | None = None
+
+
+class ClaimParams(BaseModel):
+    id: str
+    owner: str
+    lease: int = 600
@@ -1,16 +1,33 @@
-from asyncio import CancelledError
+from asyncio import CancelledError, to_thread
 from contextlib import suppress
-from typing import TYPE_CHECKING
+from csv import reader, writer
+from io import StringIO
+from json import dumps
+from pathlib import Path
+from re import compile
+from time import time
+from typing import TYPE_CHECKING, AsyncIterator, Callable, Iterable
 
+from aiofiles import open as async_open
 from aiosqlite import connect
+from httpx import AsyncClient, HTTPError
+
+from ..expansion import RecordUnavailable
+from ..translation import _
+from .static import ERROR
+from .tools import logging
 
 if TYPE_CHECKING:
     from ..module import Manager
 
-__all__ = ["IDRecorder", "DataRecorder", "MapRecorder"]
+__all__ = ["IDRecorder", "DataRecorder", "MapRecorder", "RemoteRecorder"]
 
 
 class IDRecorder:
+    TABLE = "explore_id"
+    COLUMNS = ("ID",)
+    BATCH = 1000
+
     def __init__(self, manager: "Manager"):
         self.file = manager.root.joinpath("ExploreID.db")
         self.switch = manager.download_record
@@ -18,17 +35,28 @@ class IDRecorder:
         self.cursor = None
 
     async def _connect_database(self):
-        self.database = await connect(self.file)
+        self.database = await connect(self.file, timeout=30)
         self.cursor = await self.database.cursor()
+        # 允许多个进程同时读写下载记录
+        await self.database.execute("PRAGMA journal_mode=WAL;")
         await self.database.execute(
             "CREATE TABLE IF NOT EXISTS explore_id (ID TEXT PRIMARY KEY);"
         )
+        await self.database.execute(
+            "CREATE TABLE IF NOT EXISTS explore_claim ("
+            "ID TEXT PRIMARY KEY,"
+            "OWNER TEXT NOT NULL,"
+            "EXPIRE INTEGER NOT NULL"
+            ");"
+        )
         await self.database.commit()
 
     async def select(self, id_: str):
         if self.switch:
-            await self.cursor.execute("SELECT ID FROM explore_id WHERE ID=?", (id_,))
-            return await self.cursor.fetchone()
+            async with self.database.execute(
+                "SELECT ID FROM explore_id WHERE ID=?", (id_,)
+            ) as cursor:
+                return await cursor.fetchone()
 
     async def add(
         self,
@@ -39,21 +67,196 @@ class IDRecorder:
     ) -> None:
         if self.switch:
             await self.database.execute("REPLACE INTO explore_id VALUES (?);", (id_,))
+            await self.database.execute("DELETE FROM explore_claim WHERE ID=?", (id_,))
             await self.database.commit()
 
-    async def __delete(self, id_: str) -> None:
-        if id_:
-            await self.database.execute("DELETE FROM explore_id WHERE ID=?", (id_,))
-            await self.database.commit()
+    async def claim(self, id_: str, owner: str, lease: int = 600) -> bool:
+        """
+        原子地领取作品处理权，用于多个进程或主机分配同一批作品
 
-    async def delete(self, ids: list[str]):
+        :param id_: 作品 ID
+        :param owner: 领取者标识
+        :param lease: 领取有效期，单位：秒；超时未完成的作品可被其他领取者重新领取
+        :return: 作品不存在下载记录且领取成功时返回 True
+        """
+        if not self.switch:
+            return True
+        now = int(time())
+        cursor = await self.database.execute(
+            "INSERT INTO explore_claim SELECT ?, ?, ? "
+            "WHERE NOT EXISTS (SELECT 1 FROM explore_id WHERE ID=?) "
+            "ON CONFLICT(ID) DO UPDATE SET OWNER=excluded.OWNER, EXPIRE=excluded.EXPIRE "
+            "WHERE explore_claim.EXPIRE<? OR explore_claim.OWNER=excluded.OWNER",
+            (
+                id_,
+                owner,
+                now + lease,
+                id_,
+                now,
+            ),
+        )
+        await self.database.commit()
+        return cursor.rowcount > 0
+
+    async def release(self, id_: str, owner: str) -> None:
         if self.switch:
-            [await self.__delete(i) for i in ids]
+            await self.database.execute(
+                "DELETE FROM explore_claim WHERE ID=? AND OWNER=?",
+                (
+                    id_,
+                    owner,
+                ),
+            )
+            await self.database.commit()
+
+    async def page(self, after: str = "", limit: int = BATCH) -> list[str]:
+        if not self.switch:
+            return []
+        async with self.database.execute(
+            "SELECT ID FROM explore_id WHERE ID>? ORDER BY ID LIMIT ?",
+            (
+                after,
+                limit,
+            ),
+        ) as cursor:
+            return [i[0] for i in await cursor.fetchall()]
+
+    async def delete(self, ids: list[str]) -> int:
+        if not self.switch:
+            return 0
+        if not (ids := [i for i in ids if i]):
+            return 0
+        cursor = await self.database.execute(
+            f"DELETE FROM {self.TABLE} WHERE ID IN (SELECT value FROM json_each(?))",
+            (dumps(ids),),
+        )
+        await self.database.commit()
+        return cursor.rowcount
+
+    async def delete_by(
+        self,
+        data: Path,
+        author: str = None,
+        pattern: str = None,
+    ) -> int:
+        """
+        根据作品数据删除下载记录，需要开启作品数据记录功能
+
+        :param data: 作品数据文件 ExploreData.db 路径
+        :param author: 作者 ID
+        :param pattern: 作品标题或作者昵称匹配模式，支持 SQL LIKE 通配符
+        :return: 删除的记录数量
+        """
+        if not self.switch or not (author or pattern) or not data.is_file():
+            return 0
+        conditions = []
+        values = []
+        if author:
+            conditions.append("作者ID=?")
+            values.append(author)
+        if pattern:
+            conditions.append("(作品标题 LIKE ? OR 作者昵称 LIKE ?)")
+            values.extend((pattern, pattern))
+        await self.database.execute("ATTACH DATABASE ? AS data;", (str(data),))
+        try:
+            cursor = await self.database.execute(
+                f"DELETE FROM {self.TABLE} WHERE ID IN ("
+                f"SELECT 作品ID FROM data.explore_data WHERE {' AND '.join(conditions)}"
+                ")",
+                values,
+            )
+            await self.database.commit()
+            return cursor.rowcount
+        finally:
+            await self.database.execute("DETACH DATABASE data;")
 
     async def all(self):
         if self.switch:
-            await self.cursor.execute("SELECT ID FROM explore_id")
-            return [i[0] for i in await self.cursor.fetchmany()]
+            return [i[0] async for i in self.iterate()]
+
+    async def iterate(self, size: int = BATCH) -> AsyncIterator[tuple]:
+        """
+        逐批读取记录，不会一次性将整张表读入内存
+
+        :param size: 每次从数据库读取的记录数量
+        """
+        if not self.switch:
+            return
+        async with self.database.execute(
+            f"SELECT {', '.join(self.COLUMNS)} FROM {self.TABLE}"
+        ) as cursor:
+            while rows := await cursor.fetchmany(size):
+                for row in rows:
+                    yield row
+
+    async def add_many(self, rows: Iterable, size: int = BATCH) -> int:
+        """
+        批量写入记录，所有记录在同一个事务中提交
+
+        :param rows: 记录字段元组，或单字段记录的字段值
+        :param size: 每次写入数据库的记录数量
+        :return: 写入的记录数量
+        """
+        if not self.switch:
+            return 0
+        # 指定字段名称，数据表存在额外字段时仍可正确写入
+        sql = (
+            f"REPLACE INTO {self.TABLE} ({', '.join(self.COLUMNS)}) VALUES "
+            f"({', '.join('?' for _ in self.COLUMNS)});"
+        )
+        count = 0
+        cache = []
+        for row in rows:
+            cache.append(row if isinstance(row, tuple | list) else (row,))
+            if len(cache) >= size:
+                await self.database.executemany(sql, cache)
+                count += len(cache)
+                cache.clear()
+        if cache:
+            await self.database.executemany(sql, cache)
+            count += len(cache)
+        await self.database.commit()
+        return count
+
+    async def export(self, file: Path, size: int = BATCH) -> int:
+        """
+        导出记录至制表符分隔的文本文件，单字段记录即为每行一个 ID
+
+        :return: 导出的记录数量
+        """
+        if not self.switch:
+            return 0
+        count = 0
+        buffer = StringIO()
+        output = writer(buffer, delimiter="\t", lineterminator="\n")
+        async with async_open(file, "w", encoding="utf-8") as f:
+            async for row in self.iterate(size):
+                output.writerow(row)
+                count += 1
+                if not count % size:
+                    await f.write(buffer.getvalue())
+                    buffer.seek(0)
+                    buffer.truncate()
+            await f.write(buffer.getvalue())
+        return count
+
+    async def load(self, file: Path, size: int = BATCH) -> int:
+        """
+        从 export 导出的文件导入记录，已存在的记录会被覆盖
+
+        :return: 导入的记录数量
+        """
+        if not self.switch:
+            return 0
+        with Path(file).open("r", encoding="utf-8", newline="") as f:
+            return await self.add_many(
+                (
+                    tuple(row)
+                    for row in reader(f, delimiter="\t")
+                    if len(row) == len(self.COLUMNS)
+                ),
+                size,
+            )
 
     async def __aenter__(self):
         await self._connect_database()
@@ -86,41 +289,192 @@ class DataRecorder(IDRecorder):
         ("下载地址", "TEXT"),
         ("动图地址", "TEXT"),
     )
+    # 设置作品分类器时额外记录的分类字段，与 CLI 分类模式写入的字段一致
+    CATEGORY_TABLE = (
+        ("类别1_ID", "INTEGER"),
+        ("类别2_ID", "INTEGER"),
+        ("类别1", "TEXT"),
+        ("类别2", "TEXT"),
+    )
+    TABLE = "explore_data"
+    COLUMNS = tuple(i[0] for i in DATA_TABLE)
+    METRICS_KEYS = (
+        "收藏数量",
+        "评论数量",
+        "分享数量",
+        "点赞数量",
+    )
+    COUNT = compile(r"(\d+(?:\.\d+)?)\s*([万wWkK千亿]?)")
+    UNIT = {
+        "": 1,
+        "k": 1000,
+        "K": 1000,
+        "千": 1000,
+        "w": 10000,
+        "W": 10000,
+        "万": 10000,
+        "亿": 100000000,
+    }
 
-    def __init__(self, manager: "Manager"):
+    def __init__(
+        self,
+        manager: "Manager",
+        classifier: Callable[[str, str], tuple] = None,
+    ):
+        """
+        :param classifier: 作品分类器，接收作品标题与作品标签，
+            返回 (类别1_ID, 类别2_ID, 类别1, 类别2)；设置后记录作品数据时同时写入分类
+        """
         super().__init__(manager)
         self.file = manager.folder.joinpath("ExploreData.db")
         self.switch = manager.record_data
+        self.classifier = classifier
+        self.columns = self.COLUMNS + (
+            tuple(i[0] for i in self.CATEGORY_TABLE) if classifier else ()
+        )
 
     async def _connect_database(self):
-        self.database = await connect(self.file)
+        self.database = await connect(self.file, timeout=30)
         self.cursor = await self.database.cursor()
+        await self.database.execute("PRAGMA journal_mode=WAL;")
         await self.database.execute(f"""CREATE TABLE IF NOT EXISTS explore_data (
         {",".join(" ".join(i) for i in self.DATA_TABLE)}
         );""")
+        # 作品互动数据快照，仅在数据发生变化时追加记录
+        await self.database.execute(f"""CREATE TABLE IF NOT EXISTS explore_metrics (
+        作品ID TEXT NOT NULL,
+        采集时间 INTEGER NOT NULL,
+        {", ".join(f"{i} INTEGER" for i in self.METRICS_KEYS)},
+        PRIMARY KEY (作品ID, 采集时间)
+        ) WITHOUT ROWID;""")
+        if self.classifier:
+            await self.__add_category_columns()
         await self.database.commit()
 
+    async def __add_category_columns(self) -> None:
+        async with self.database.execute("PRAGMA table_info(explore_data);") as cursor:
+            columns = {i[1] for i in await cursor.fetchall()}
+        for name, type_ in self.CATEGORY_TABLE:
+            if name not in columns:
+                await self.database.execute(
+                    f"ALTER TABLE explore_data ADD COLUMN {name} {type_};"
+                )
+
     async def select(self, id_: str):
         pass
 
     async def add(self, **kwargs) -> None:
         if self.switch:
+            values = self.__generate_values(kwargs)
+            if self.classifier:
+                values += await self.__classify(kwargs)
             await self.database.execute(
                 f"""REPLACE INTO explore_data (
-        {", ".join(i[0] for i in self.DATA_TABLE)}
+        {", ".join(self.columns)}
         ) VALUES (
-        {", ".join("?" for _ in kwargs)}
+        {", ".join("?" for _ in values)}
         );""",
-                self.__generate_values(kwargs),
+                values,
             )
+            await self.__add_metrics(kwargs)
             await self.database.commit()
 
-    async def __delete(self, id_: str) -> None:
-        pass
+    async def __classify(self, data: dict) -> tuple:
+        """分类失败时分类字段留空，可通过 CLI 分类模式补充处理"""
+        try:
+            return tuple(
+                await to_thread(
+                    self.classifier,
+                    data["作品标题"] or "",
+                    data["作品标签"] or "",
+                )
+            )
+        except Exception as error:
+            logging(
+                None,
+                _("作品 {0} 分类失败：{1}").format(data["作品ID"], repr(error)),
+                ERROR,
+            )
+            return (None,) * len(self.CATEGORY_TABLE)
+
+    async def __add_metrics(self, data: dict) -> None:
+        values = tuple(self.convert_count(data[i]) for i in self.METRICS_KEYS)
+        async with self.database.execute(
+            f"SELECT {', '.join(self.METRICS_KEYS)} FROM explore_metrics "
+            "WHERE 作品ID=? ORDER BY 采集时间 DESC LIMIT 1",
+            (data["作品ID"],),
+        ) as cursor:
+            if await cursor.fetchone() == values:
+                return
+        await self.database.execute(
+            "REPLACE INTO explore_metrics VALUES (?, ?, ?, ?, ?, ?);",
+            (
+                data["作品ID"],
+                int(time()),
+                *values,
+            ),
+        )
+
+    async def metrics(
+        self,
+        id_: str,
+        start: int = None,
+        end: int = None,
+    ) -> list[tuple]:
+        """
+        查询作品互动数据快照
+
+        :param id_: 作品 ID
+        :param start: 起始时间戳，单位：秒
+        :param end: 结束时间戳，单位：秒
+        :return: 按采集时间升序排列的 (采集时间, 收藏数量, 评论数量, 分享数量, 点赞数量)
+        """
+        if not self.switch:
+            return []
+        async with self.database.execute(
+            f"SELECT 采集时间, {', '.join(self.METRICS_KEYS)} FROM explore_metrics "
+            "WHERE 作品ID=? AND 采集时间>=? AND 采集时间<=? ORDER BY 采集时间",
+            (
+                id_,
+                start or 0,
+                end or 2**63 - 1,
+            ),
+        ) as cursor:
+            return list(await cursor.fetchall())
+
+    async def growth(
+        self,
+        id_: str,
+        start: int = None,
+        end: int = None,
+    ) -> list[tuple]:
+        """
+        计算作品互动数据增长曲线
+
+        :return: 相邻快照之间的 (采集时间, 收藏增量, 评论增量, 分享增量, 点赞增量)
+        """
+        data = await self.metrics(id_, start, end)
+        return [
+            (j[0], *(b - a for a, b in zip(i[1:], j[1:])))
+            for i, j in zip(data, data[1:])
+        ]
+
+    @classmethod
+    def convert_count(cls, value: str | int) -> int:
+        if isinstance(value, int):
+            return value
+        if not (value := str(value).strip()) or value.startswith("-"):
+            return -1
+        if not (m := cls.COUNT.search(value)):
+            return -1
+        return int(float(m.group(1)) * cls.UNIT[m.group(2)])
 
     async def delete(self, ids: list | tuple):
         pass
 
+    async def delete_by(self, *args, **kwargs):
+        pass
+
     async def all(self):
         pass
 
@@ -129,28 +483,56 @@ class DataRecorder(IDRecorder):
 
 
 class MapRecorder(IDRecorder):
+    TABLE = "mapping_data"
+    COLUMNS = (
+        "ID",
+        "NAME",
+    )
+
     def __init__(self, manager: "Manager"):
         super().__init__(manager)
         self.file = manager.root.joinpath("MappingData.db")
         self.switch = manager.author_archive
 
     async def _connect_database(self):
-        self.database = await connect(self.file)
+        self.database = await connect(self.file, timeout=30)
         self.cursor = await self.database.cursor()
+        await self.database.execute("PRAGMA journal_mode=WAL;")
         await self.database.execute(
             "CREATE TABLE IF NOT EXISTS mapping_data ("
             "ID TEXT PRIMARY KEY,"
             "NAME TEXT NOT NULL"
             ");"
         )
+        # 作者文件夹的文件索引，PATH 为相对作者文件夹的路径，WORK 为作品 ID
+        await self.database.execute(
+            "CREATE TABLE IF NOT EXISTS mapping_file ("
+            "ID TEXT NOT NULL,"
+            "ROOT TEXT NOT NULL,"
+            "PATH TEXT NOT NULL,"
+            "WORK TEXT NOT NULL DEFAULT '',"
+            "PRIMARY KEY (ID, ROOT, PATH)"
+            ") WITHOUT ROWID;"
+        )
+        await self.database.execute(
+            "CREATE INDEX IF NOT EXISTS mapping_file_work ON mapping_file (WORK);"
+        )
+        # 尚未完成的作者文件夹重命名，程序中断后再次运行时继续处理
+        await self.database.execute(
+            "CREATE TABLE IF NOT EXISTS mapping_journal ("
+            "ID TEXT PRIMARY KEY,"
+            "OLD TEXT NOT NULL,"
+            "NEW TEXT NOT NULL"
+            ");"
+        )
         await self.database.commit()
 
     async def select(self, id_: str):
         if self.switch:
-            await self.cursor.execute(
+            async with self.database.execute(
                 "SELECT NAME FROM mapping_data WHERE ID=?", (id_,)
-            )
-            return await self.cursor.fetchone()
+            ) as cursor:
+                return await cursor.fetchone()
 
     async def add(self, id_: str, name: str, *args, **kwargs) -> None:
         if self.switch:
@@ -163,13 +545,240 @@ class MapRecorder(IDRecorder):
             )
             await self.database.commit()
 
-    async def __delete(self, id_: str) -> None:
+    async def delete(self, ids: list[str]):
         pass
 
-    async def delete(self, ids: list[str]):
+    async def delete_by(self, *args, **kwargs):
         pass
 
     async def all(self):
         if self.switch:
-            await self.cursor.execute("SELECT ID, NAME FROM mapping_data")
-            return [i[0] for i in await self.cursor.fetchmany()]
+            return [i[0] async for i in self.iterate()]
+
+    async def items(self) -> list[tuple[str, str]]:
+        """读取全部作者别名映射，返回 (作者 ID, 作者别名)"""
+        if self.switch:
+            return [i async for i in self.iterate()]
+        return []
+
+    async def indexed(self, id_: str, root: str) -> bool:
+        """作者在下载文件夹中是否已经建立文件索引"""
+        async with self.database.execute(
+            "SELECT 1 FROM mapping_file WHERE ID=? AND ROOT=? LIMIT 1;",
+            (
+                id_,
+                root,
+            ),
+        ) as cursor:
+            return bool(await cursor.fetchone())
+
+    async def files(self, id_: str) -> dict[str, list[str]]:
+        """返回作者在各个下载文件夹中的文件相对路径"""
+        files = {}
+        async with self.database.execute(
+            "SELECT ROOT, PATH FROM mapping_file WHERE ID=?;",
+            (id_,),
+        ) as cursor:
+            async for root, path in cursor:
+                files.setdefault(root, []).append(path)
+        return files
+
+    async def add_files(
+        self,
+        id_: str,
+        root: str,
+        paths: Iterable[str],
+        work: str = "",
+    ) -> None:
+        if self.switch:
+            await self.database.executemany(
+                "REPLACE INTO mapping_file VALUES (?, ?, ?, ?);",
+                ((id_, root, i, work) for i in paths),
+            )
+            await self.database.commit()
+
+    async def begin_rename(self, id_: str, old: str, new: str) -> None:
+        """更新作者别名并记录待处理的重命名"""
+        if self.switch:
+            await self.database.execute(
+                "REPLACE INTO mapping_data VALUES (?, ?);",
+                (
+                    id_,
+                    new,
+                ),
+            )
+            await self.database.execute(
+                "REPLACE INTO mapping_journal VALUES (?, ?, ?);",
+                (
+                    id_,
+                    old,
+                    new,
+                ),
+            )
+            await self.database.commit()
+
+    async def finish_rename(
+        self,
+        id_: str,
+        changes: list[tuple[str, str, str]],
+    ) -> None:
+        """
+        以单个事务更新文件索引并移除重命名记录
+
+        :param changes: 发生变化的文件，元素为 (下载文件夹, 原相对路径, 新相对路径)
+        """
+        if self.switch:
+            await self.database.executemany(
+                "UPDATE OR REPLACE mapping_file SET PATH=?4 "
+                "WHERE ID=?1 AND ROOT=?2 AND PATH=?3;",
+                ((id_, *i) for i in changes),
+            )
+            await self.database.execute(
+                "DELETE FROM mapping_journal WHERE ID=?;",
+                (id_,),
+            )
+            await self.database.commit()
+
+    async def journals(self) -> list[tuple[str, str, str]]:
+        """返回尚未完成的重命名，元素为 (作者 ID, 原别名, 新别名)"""
+        if not self.switch:
+            return []
+        async with self.database.execute(
+            "SELECT ID, OLD, NEW FROM mapping_journal;"
+        ) as cursor:
+            return list(await cursor.fetchall())
+
+
+class RemoteRecorder(IDRecorder):
+    """
+    通过 XHS-Downloader 服务器共享下载记录，接口与 IDRecorder 保持一致
+
+    请求失败时重试，仍然失败时抛出 RecordUnavailable，由调用方跳过处理作品
+    """
+
+    def __init__(self, manager: "Manager", server: str, token: str = ""):
+        super().__init__(manager)
+        self.server = server.rstrip("/")
+        self.token = token
+        self.timeout = manager.timeout
+        self.retry = manager.retry
+        self.client: AsyncClient | None = None
+
+    async def _connect_database(self):
+        self.client = AsyncClient(
+            base_url=self.server,
+            timeout=self.timeout,
+            headers={"Authorization": f"Bearer {self.token}"} if self.token else None,
+        )
+
+    async def __request(self, method: str, url: str, **kwargs) -> dict:
+        error = None
+        for __ in range(self.retry + 1):
+            try:
+                response = await self.client.request(method, url, **kwargs)
+                response.raise_for_status()
+                return response.json()
+            except HTTPError as e:
+                error = e
+        raise RecordUnavailable(
+            _("下载记录服务器请求失败，{0}: {1}").format(url, repr(error))
+        )
+
+    async def select(self, id_: str):
+        if self.switch:
+            r = await self.__request("GET", f"/record/{id_}")
+            return (id_,) if r["exists"] else None
+
+    async def add(self, id_: str, *args, **kwargs) -> None:
+        if self.switch:
+            await self.__request("POST", "/record/", json={"ids": [id_]})
+
+    async def add_many(self, rows: Iterable, size: int = IDRecorder.BATCH) -> int:
+        if not self.switch:
+            return 0
+        count = 0
+        cache = []
+        for row in rows:
+            cache.append(row[0] if isinstance(row, tuple | list) else row)
+            if len(cache) >= size:
+                count += await self.__add_many(cache)
+                cache = []
+        if cache:
+            count += await self.__add_many(cache)
+        return count
+
+    async def __add_many(self, ids: list[str]) -> int:
+        r = await self.__request("POST", "/record/", json={"ids": ids})
+        return r["count"]
+
+    async def delete(self, ids: list[str]) -> int:
+        if not self.switch:
+            return 0
+        r = await self.__request("POST", "/record/delete", json={"ids": ids})
+        return r["count"]
+
+    async def delete_by(
+        self,
+        data=None,
+        author: str = None,
+        pattern: str = None,
+    ) -> int:
+        if not self.switch or not (author or pattern):
+            return 0
+        r = await self.__request(
+            "POST",
+            "/record/delete",
+            json={
+                "author": author,
+                "pattern": pattern,
+            },
+        )
+        return r["count"]
+
+    async def claim(self, id_: str, owner: str, lease: int = 600) -> bool:
+        if not self.switch:
+            return True
+        r = await self.__request(
+            "POST",
+            "/record/claim",
+            json={
+                "id": id_,
+                "owner": owner,
+                "lease": lease,
+            },
+        )
+        return bool(r["result"])
+
+    async def release(self, id_: str, owner: str) -> None:
+        if self.switch:
+            await self.__request(
+                "POST",
+                "/record/release",
+                json={
+                    "id": id_,
+                    "owner": owner,
+                },
+            )
+
+    async def page(self, after: str = "", limit: int = IDRecorder.BATCH) -> list[str]:
+        if not self.switch:
+            return []
+        r = await self.__request(
+            "GET",
+            "/record/",
+            params={
+                "after": after,
+                "limit": limit,
+            },
+        )
+        return r["ids"]
+
+    async def iterate(self, size: int = IDRecorder.BATCH) -> AsyncIterator[tuple]:
+        after = ""
+        while ids := await self.page(after, size):
+            for i in ids:
+                yield (i,)
+            after = ids[-1]
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.client.aclose()
@@ -20,6 +20,7 @@ class Settings:
         "chunk": 1024 * 1024 * 2,
         "max_retry": 5,
         "record_data": False,
+        "classifier": False,
         "image_format": "PNG",
         "image_download": True,
         "video_download": True,
@@ -29,6 +30,11 @@ class Settings:
         "author_archive": False,
         "write_mtime": False,
         "language": "zh_CN",
+        "record_server": "",
+        "record_token": "",
+        "cache_ttl": 300,
+        "cache_size": 1024,
+        "cache_persist": False,
     }
     encode = "UTF-8-SIG" if system() == "Windows" else "UTF-8"
 
@@ -40,7 +46,8 @@ class Settings:
 
     def read(self) -> dict:
         with self.file.open("r", encoding=self.encode) as f:
-            return load(f)
+            # 旧版本配置文件缺少的参数使用默认值
+            return self.default | load(f)
 
     def create(self) -> dict:
         with self.file.open("w", encoding=self.encode) as f:
@@ -0,0 +1,462 @@
+from asyncio import CancelledError
+from contextlib import suppress
+from json import dumps, loads
+from pathlib import Path
+from time import time
+from typing import AsyncIterator, Iterable
+
+from aiosqlite import connect
+
+__all__ = ["TaskQueue", "JobRecorder"]
+
+
+class TaskQueue:
+    """持久化作品任务队列，可供多个进程同时领取任务"""
+
+    PENDING = 0
+    RUNNING = 1
+    SUCCESS = 2
+    FAILURE = 3
+    BATCH = 8
+    # 任务租约时长，单位：秒；处理中的任务超过该时长未续期时可被重新领取
+    LEASE = 600
+
+    def __init__(self, file: Path):
+        self.file = file
+        self.database = None
+        self.cursor = None
+
+    async def _connect_database(self):
+        self.database = await connect(self.file, timeout=30)
+        self.cursor = await self.database.cursor()
+        await self.database.execute("PRAGMA journal_mode=WAL;")
+        await self.database.execute(
+            "CREATE TABLE IF NOT EXISTS task_queue ("
+            "ID INTEGER PRIMARY KEY AUTOINCREMENT,"
+            "URL TEXT NOT NULL UNIQUE,"
+            "STATUS INTEGER NOT NULL DEFAULT 0,"
+            "OWNER TEXT,"
+            "RESULT TEXT,"
+            "UPDATED INTEGER NOT NULL DEFAULT 0"
+            ");"
+        )
+        await self.__add_updated_column()
+        await self.database.execute(
+            "CREATE INDEX IF NOT EXISTS task_status ON task_queue (STATUS, ID);"
+        )
+        await self.database.execute(
+            "CREATE TABLE IF NOT EXISTS task_source ("
+            "SOURCE TEXT PRIMARY KEY,"
+            "OFFSET INTEGER NOT NULL"
+            ");"
+        )
+        await self.database.commit()
+
+    async def __add_updated_column(self) -> None:
+        """旧版本任务表缺少租约字段，其中处理中的任务视为租约已过期"""
+        async with self.database.execute("PRAGMA table_info(task_queue);") as cursor:
+            columns = {i[1] for i in await cursor.fetchall()}
+        if "UPDATED" not in columns:
+            await self.database.execute(
+                "ALTER TABLE task_queue ADD COLUMN UPDATED INTEGER NOT NULL DEFAULT 0;"
+            )
+
+    async def put(
+        self,
+        urls: Iterable[str],
+        source: str = None,
+        offset: int = None,
+    ) -> int:
+        """
+        写入任务，已存在的链接不会重复写入，处理失败的链接重新设置为待处理状态
+
+        :param urls: 作品链接
+        :param source: 任务来源文件，与 offset 同时提供时在同一事务内记录读取进度
+        :param offset: 来源文件已读取的字节数
+        :return: 新增及重新处理的任务数量
+        """
+        cursor = await self.database.executemany(
+            "INSERT INTO task_queue (URL) VALUES (?1) ON CONFLICT(URL) DO UPDATE "
+            "SET STATUS=?2, OWNER=NULL, RESULT=NULL WHERE STATUS=?3;",
+            ((i, self.PENDING, self.FAILURE) for i in urls),
+        )
+        if source is not None:
+            await self.database.execute(
+                "REPLACE INTO task_source VALUES (?, ?);",
+                (
+                    source,
+                    offset,
+                ),
+            )
+        await self.database.commit()
+        return max(cursor.rowcount, 0)
+
+    async def offset(self, source: str) -> int:
+        """读取任务来源文件的读取进度"""
+        async with self.database.execute(
+            "SELECT OFFSET FROM task_source WHERE SOURCE=?;",
+            (source,),
+        ) as cursor:
+            return row[0] if (row := await cursor.fetchone()) else 0
+
+    async def claim(
+        self,
+        owner: str,
+        shard: int = 0,
+        shards: int = 1,
+        size: int = BATCH,
+    ) -> list[tuple[int, str]]:
+        """
+        领取一批待处理任务，优先领取所属分片的任务，所属分片为空时领取其他分片的任务；
+        租约过期的处理中任务视为待处理任务
+
+        :param owner: 领取者标识
+        :param shard: 分片序号
+        :param shards: 分片总数
+        :param size: 单次领取的任务数量
+        :return: 任务 ID 与作品链接
+        """
+        if tasks := await self.__claim(
+            owner,
+            "AND ID % ? = ?",
+            (shards, shard),
+            size,
+        ):
+            return tasks
+        return await self.__claim(owner, "", (), size)
+
+    async def __claim(
+        self,
+        owner: str,
+        condition: str,
+        values: tuple,
+        size: int,
+    ) -> list[tuple[int, str]]:
+        now = int(time())
+        # 在同一次调用内完成语句，避免其他协程提交时语句仍未结束
+        tasks = await self.database.execute_fetchall(
+            "UPDATE task_queue SET STATUS=?, OWNER=?, UPDATED=? WHERE ID IN ("
+            "SELECT ID FROM task_queue WHERE (STATUS=? OR (STATUS=? AND UPDATED<?)) "
+            f"{condition} ORDER BY ID LIMIT ?"
+            ") RETURNING ID, URL;",
+            (
+                self.RUNNING,
+                owner,
+                now,
+                self.PENDING,
+                self.RUNNING,
+                now - self.LEASE,
+                *values,
+                size,
+            ),
+        )
+        await self.database.commit()
+        return sorted(tasks)
+
+    async def heartbeat(self, owner: str) -> None:
+        """续期领取者全部处理中任务的租约"""
+        await self.database.execute(
+            "UPDATE task_queue SET UPDATED=? WHERE OWNER=? AND STATUS=?;",
+            (
+                int(time()),
+                owner,
+                self.RUNNING,
+            ),
+        )
+        await self.database.commit()
+
+    async def finish(self, id_: int, result: dict | list | None) -> None:
+        await self.database.execute(
+            "UPDATE task_queue SET STATUS=?, RESULT=? WHERE ID=?;",
+            (
+                self.SUCCESS if result else self.FAILURE,
+                dumps(result, ensure_ascii=False),
+                id_,
+            ),
+        )
+        await self.database.commit()
+
+    async def recover(self, failure=False) -> int:
+        """
+        将租约过期的中断任务重置为待处理状态，failure 为 True 时同时重置失败的任务
+
+        其他进程正在处理的任务会定期续期，不会被重置
+        """
+        status = (self.FAILURE,) if failure else ()
+        cursor = await self.database.execute(
+            "UPDATE task_queue SET STATUS=?, OWNER=NULL WHERE (STATUS=? AND UPDATED<?)"
+            f"{' OR STATUS=?' * len(status)};",
+            (
+                self.PENDING,
+                self.RUNNING,
+                int(time()) - self.LEASE,
+                *status,
+            ),
+        )
+        await self.database.commit()
+        return cursor.rowcount
+
+    async def statistics(self, owner: str = "") -> dict[int, int]:
+        """统计各状态的任务数量，owner 不为空时仅统计领取者标识以 owner 开头的任务"""
+        async with self.database.execute(
+            "SELECT STATUS, COUNT(*) FROM task_queue "
+            "WHERE substr(COALESCE(OWNER, ''), 1, ?1) = ?2 GROUP BY STATUS;",
+            (
+                len(owner),
+                owner,
+            ),
+        ) as cursor:
+            return dict(await cursor.fetchall())
+
+    async def results(self, size: int = 1000) -> AsyncIterator[tuple[str, str]]:
+        async with self.database.execute(
+            "SELECT URL, RESULT FROM task_queue WHERE STATUS=? ORDER BY ID;",
+            (self.SUCCESS,),
+        ) as cursor:
+            while rows := await cursor.fetchmany(size):
+                for row in rows:
+                    yield row
+
+    async def __aenter__(self):
+        await self._connect_database()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        with suppress(CancelledError):
+            await self.cursor.close()
+        await self.database.close()
+
+
+class JobRecorder:
+    """API 异步任务记录，任务参数、进度与每个作品的处理结果均持久化储存"""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCESS = "success"
+    FAILURE = "failure"
+    CANCELLED = "cancelled"
+    # 任务租约时长，单位：秒；处理中的任务超过该时长未续期时可被其他进程重新领取
+    LEASE = 60
+    # 任务结束后不再保留提交者的 Cookie 与代理
+    FORGET = "PARAMS=json_remove(PARAMS, '$.cookie', '$.proxy')"
+    COLUMNS = (
+        "ID",
+        "PARAMS",
+        "STATUS",
+        "TOTAL",
+        "FINISHED",
+        "CREATED",
+        "UPDATED",
+    )
+
+    def __init__(self, file: Path):
+        self.file = file
+        self.database = None
+        self.cursor = None
+
+    async def _connect_database(self):
+        self.database = await connect(self.file, timeout=30)
+        self.cursor = await self.database.cursor()
+        await self.database.execute("PRAGMA journal_mode=WAL;")
+        await self.database.execute(
+            "CREATE TABLE IF NOT EXISTS api_job ("
+            "ID TEXT PRIMARY KEY,"
+            "PARAMS TEXT NOT NULL,"
+            "STATUS TEXT NOT NULL,"
+            "TOTAL INTEGER NOT NULL DEFAULT 0,"
+            "FINISHED INTEGER NOT NULL DEFAULT 0,"
+            "CREATED INTEGER NOT NULL,"
+            "UPDATED INTEGER NOT NULL,"
+            "OWNER TEXT"
+            ");"
+        )
+        await self.database.execute(
+            "CREATE INDEX IF NOT EXISTS api_job_status ON api_job (STATUS, CREATED);"
+        )
+        await self.database.execute(
+            "CREATE TABLE IF NOT EXISTS api_job_result ("
+            "JOB TEXT NOT NULL,"
+            "URL TEXT NOT NULL,"
+            "MESSAGE TEXT,"
+            "DATA TEXT,"
+            "PRIMARY KEY (JOB, URL)"
+            ") WITHOUT ROWID;"
+        )
+        await self.database.commit()
+
+    async def add(self, id_: str, params: dict) -> None:
+        now = int(time())
+        await self.database.execute(
+            "INSERT INTO api_job (ID, PARAMS, STATUS, CREATED, UPDATED) "
+            "VALUES (?, ?, ?, ?, ?);",
+            (
+                id_,
+                dumps(params, ensure_ascii=False),
+                self.PENDING,
+                now,
+                now,
+            ),
+        )
+        await self.database.commit()
+
+    async def select(self, id_: str) -> dict | None:
+        async with self.database.execute(
+            f"SELECT {', '.join(self.COLUMNS)} FROM api_job WHERE ID=?;",
+            (id_,),
+        ) as cursor:
+            if not (row := await cursor.fetchone()):
+                return None
+        job = dict(zip((i.lower() for i in self.COLUMNS), row))
+        job["params"] = loads(job["params"])
+        return job
+
+    async def claim(self, owner: str, lease: int = LEASE) -> tuple[str, dict] | None:
+        """
+        原子地领取最早提交的待处理任务，多个服务器进程共享同一个任务表
+
+        :param lease: 租约时长，处理进程异常退出后，其任务在租约过期后重新领取
+        """
+        now = int(time())
+        # 在同一次调用内完成语句，避免其他协程提交时语句仍未结束
+        rows = await self.database.execute_fetchall(
+            "UPDATE api_job SET STATUS=?1, OWNER=?2, UPDATED=?3 WHERE ID=("
+            "SELECT ID FROM api_job WHERE STATUS=?4 OR (STATUS=?1 AND UPDATED<?5) "
+            "ORDER BY CREATED LIMIT 1"
+            ") RETURNING ID, PARAMS;",
+            (
+                self.RUNNING,
+                owner,
+                now,
+                self.PENDING,
+                now - lease,
+            ),
+        )
+        await self.database.commit()
+        return (rows[0][0], loads(rows[0][1])) if rows else None
+
+    async def heartbeat(self, id_: str, owner: str) -> bool:
+        """续期任务租约，任务已被取消、已结束或已被其他进程领取时返回 False"""
+        cursor = await self.database.execute(
+            "UPDATE api_job SET UPDATED=? WHERE ID=? AND OWNER=? AND STATUS=?;",
+            (
+                int(time()),
+                id_,
+                owner,
+                self.RUNNING,
+            ),
+        )
+        await self.database.commit()
+        return cursor.rowcount > 0
+
+    async def status(self, id_: str) -> str | None:
+        async with self.database.execute(
+            "SELECT STATUS FROM api_job WHERE ID=?;",
+            (id_,),
+        ) as cursor:
+            return row[0] if (row := await cursor.fetchone()) else None
+
+    async def pending(self) -> int:
+        async with self.database.execute(
+            "SELECT COUNT(*) FROM api_job WHERE STATUS=?;",
+            (self.PENDING,),
+        ) as cursor:
+            return (await cursor.fetchone())[0]
+
+    async def update(self, id_: str, status: str = None, total: int = None) -> None:
+        forget = (
+            f", {self.FORGET}"
+            if status in (self.SUCCESS, self.FAILURE, self.CANCELLED)
+            else ""
+        )
+        await self.database.execute(
+            "UPDATE api_job SET STATUS=COALESCE(?, STATUS), "
+            f"TOTAL=COALESCE(?, TOTAL), UPDATED=?{forget} WHERE ID=?;",
+            (
+                status,
+                total,
+                int(time()),
+                id_,
+            ),
+        )
+        await self.database.commit()
+
+    async def cancel(self, id_: str) -> bool:
+        cursor = await self.database.execute(
+            f"UPDATE api_job SET STATUS=?, UPDATED=?, {self.FORGET} "
+            "WHERE ID=? AND STATUS IN (?, ?);",
+            (
+                self.CANCELLED,
+                int(time()),
+                id_,
+                self.PENDING,
+                self.RUNNING,
+            ),
+        )
+        await self.database.commit()
+        return cursor.rowcount > 0
+
+    async def add_result(
+        self,
+        id_: str,
+        url: str,
+        message: str,
+        data: dict | None,
+    ) -> None:
+        await self.database.execute(
+            "REPLACE INTO api_job_result VALUES (?, ?, ?, ?);",
+            (
+                id_,
+                url,
+                message,
+                dumps(data, ensure_ascii=False),
+            ),
+        )
+        await self.database.execute(
+            "UPDATE api_job SET FINISHED=("
+            "SELECT COUNT(*) FROM api_job_result WHERE JOB=?"
+            "), UPDATED=? WHERE ID=?;",
+            (
+                id_,
+                int(time()),
+                id_,
+            ),
+        )
+        await self.database.commit()
+
+    async def results(self, id_: str) -> list[dict]:
+        async with self.database.execute(
+            "SELECT URL, MESSAGE, DATA FROM api_job_result WHERE JOB=?;",
+            (id_,),
+        ) as cursor:
+            return [
+                {"url": url, "message": message, "data": loads(data)}
+                for url, message, data in await cursor.fetchall()
+            ]
+
+    async def finished(self, id_: str) -> set[str]:
+        async with self.database.execute(
+            "SELECT URL FROM api_job_result WHERE JOB=?;",
+            (id_,),
+        ) as cursor:
+            return {i[0] for i in await cursor.fetchall()}
+
+    async def recover(self) -> int:
+        """将中断的任务重置为待处理状态，仅应在没有服务器进程处理任务时调用"""
+        cursor = await self.database.execute(
+            "UPDATE api_job SET STATUS=?, OWNER=NULL WHERE STATUS=?;",
+            (
+                self.PENDING,
+                self.RUNNING,
+            ),
+        )
+        await self.database.commit()
+        return cursor.rowcount
+
+    async def __aenter__(self):
+        await self._connect_database()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        with suppress(CancelledError):
+            await self.cursor.close()
+        await self.database.close()
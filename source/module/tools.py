@@ -5,6 +5,7 @@ from rich import print
 from rich.text import Text
 
 from ..translation import _
+from .metrics import METRICS
 from .static import INFO
 
 
@@ -13,6 +14,7 @@ def retry(function):
         if result := await function(self, *args, **kwargs):
             return result
         for __ in range(self.retry):
+            METRICS.retries.inc(function=function.__name__)
             if result := await function(self, *args, **kwargs):
                 return result
         return result
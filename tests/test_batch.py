@@ -0,0 +1,36 @@
+from tempfile import TemporaryDirectory
+from unittest import IsolatedAsyncioTestCase, main
+
+from source import XHS
+from source.module import ExtractParams
+
+
+class BatchTest(IsolatedAsyncioTestCase):
+    async def test_deduplicate_links_to_same_note(self):
+        with TemporaryDirectory() as folder:
+            xhs = XHS(work_path=folder, download_record=False, _print=False)
+            urls = []
+
+            async def deal_request(url, extract):
+                urls.append(url)
+                return "", {"作品ID": url}
+
+            xhs._XHS__deal_request = deal_request
+            links = [
+                "https://www.xiaohongshu.com/explore/abc?xsec_token=1",
+                "https://www.xiaohongshu.com/explore/abc?xsec_token=2",
+                "https://www.xiaohongshu.com/explore/def?xsec_token=1",
+            ]
+            lines = [
+                i
+                async for i in xhs._XHS__deal_batch(
+                    links,
+                    ExtractParams(url=" ".join(links)),
+                )
+            ]
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(sorted(urls), [links[0], links[2]])
+
+
+if __name__ == "__main__":
+    main()